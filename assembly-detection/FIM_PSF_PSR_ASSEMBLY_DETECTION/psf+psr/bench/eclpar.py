@@ -0,0 +1,37 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : eclpar.py
+# Contents: benchmark of serial and parallel mining with pyfim.eclat
+#           on a synthetic activity raster
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys     import argv, path, stderr
+from os.path import join, dirname, abspath
+from random  import seed as srand, random
+from time    import time
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+from pyfim   import eclat
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    T      = int  (argv[1]) if len(argv) > 1 else 2000
+    N      = int  (argv[2]) if len(argv) > 2 else 60
+    rate   = float(argv[3]) if len(argv) > 3 else 0.25
+    target = argv[4]        if len(argv) > 4 else 'c'
+    cpus   = int  (argv[5]) if len(argv) > 5 else 0
+    srand(1)                    # get the benchmark parameters
+    tracts = [[n for n in range(N) if random() < rate] for t in range(T)]
+    t = time()                  # mine in the current process
+    ref = sorted(eclat(tracts, target, -10, 2, -1, []))
+    ts  = time()-t
+    t = time()                  # mine with a pool of processes
+    res = sorted(eclat(tracts, target, -10, 2, -1, [], cpus=cpus))
+    tp  = time()-t
+    if res != ref: stderr.write('item sets differ!\n'); exit(1)
+    print('%d transaction(s), %d item(s), rate %g, target %s'
+          % (T, N, rate, target))
+    print('%d item set(s)' % len(ref))
+    print('serial  : %8.3fs' % ts)
+    print('parallel: %8.3fs (cpus: %s)' % (tp, cpus or 'all'))
+    print('speedup : %8.1fx' % (ts/tp))
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : estpsp.py
+# Contents: benchmark of estimating a pattern spectrum with
+#           patspec.estpsp() compared to generating it from
+#           surrogate data sets with patspec.fimpsp()
+#           (surrogates need the compiled fim module or numpy)
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys             import argv, path, stderr
+from os.path         import join, dirname, abspath
+from random          import seed as srand, random
+from time            import time
+from multiprocessing import cpu_count
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+from patspec         import estpsp, fimpsp, psp2bdr
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    T    = int  (argv[1]) if len(argv) > 1 else 1000
+    N    = int  (argv[2]) if len(argv) > 2 else 50
+    rate = float(argv[3]) if len(argv) > 3 else 0.05
+    cnt  = int  (argv[4]) if len(argv) > 4 else 1000
+    surr = argv[5]        if len(argv) > 5 else 'r'
+    cpus = int  (argv[6]) if len(argv) > 6 else cpu_count()
+    srand(1)                    # create a synthetic raster with
+    tracts = [tuple([n for n in range(N)   # heterogeneous item rates
+                     if random() < rate*(0.5+n/float(N))])
+              for t in range(T)]
+    print('%d transaction(s), %d item(s), rate %g, %d surrogate(s)'
+          % (T, N, rate, cnt))
+    t = time()                  # estimate the pattern spectrum
+    est = estpsp(tracts, 's', -2, 2, -1, '#', cnt, 0.5, 1000, 1)
+    te  = time()-t
+    print('estimated : %8.3fs, %5d signature(s)' % (te, len(est)))
+    t = time()                  # generate the pattern spectrum
+    gen = fimpsp(tracts, 's', -2, 2, -1, '#', cnt, surr, 1, cpus)
+    tg  = time()-t; stderr.write('\n')
+    print('surrogates: %8.3fs, %5d signature(s) (%.1fx)'
+          % (tg, len(gen), tg/te))
+    be = psp2bdr(est); bg = psp2bdr(gen)
+    print('size  estimated  surrogates')
+    for z in range(2, max(len(be), len(bg))):
+        print('%4d  %9s  %10s' % (z, be[z] if z < len(be) else '-',
+                                     bg[z] if z < len(bg) else '-'))
+    for N in [2, 3]:            # check small item alphabets
+        tracts = [tuple([n for n in range(N) if random() < 0.8])
+                  for t in range(100)]
+        for alpha in [0.0, 0.5, 1.0]:
+            est = estpsp(tracts, 's', -2, 2, -1, '#', cnt, alpha, 100, 1)
+            if not est or not all([v == v for v in est.values()]):
+                stderr.write('estimation failed for %d item(s)!\n' % N)
+                exit(1)         # check for a (finite) spectrum
+            if max([z for z,c in est]) != N:
+                stderr.write('size %d is missing!\n' % N); exit(1)
+        print('%d item(s) : %5d signature(s)' % (N, len(est)))
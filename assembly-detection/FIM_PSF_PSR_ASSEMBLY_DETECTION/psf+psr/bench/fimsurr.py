@@ -0,0 +1,47 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : fimsurr.py
+# Contents: benchmark of the vectorized surrogate data generation
+#           of fimsurr.py (surrogate data sets per second)
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys     import argv, path, stderr
+from os.path import join, dirname, abspath
+from time    import time
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+import numpy as np
+from fimsurr import randomize, swap, shuffle, gensurr
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    T     = int  (argv[1]) if len(argv) > 1 else 1000
+    N     = int  (argv[2]) if len(argv) > 2 else 100
+    rate  = float(argv[3]) if len(argv) > 3 else 0.05
+    cnt   = int  (argv[4]) if len(argv) > 4 else 64
+    batch = int  (argv[5]) if len(argv) > 5 else 16
+    rng   = np.random.default_rng(1)  # get the benchmark parameters
+    mat   = rng.random((T, N)) < rate # and create a synthetic raster
+    tab   = np.argsort(rng.random((T, 10)), axis=0) +T*rng.permutation(10)
+    print('%d transaction(s), %d item(s), rate %g, %d surrogate(s)'
+          % (T, N, rate, cnt))
+    for name, gen, data in [('random', randomize, mat),
+                            ('swap',   swap,      mat),
+                            ('shuffle',shuffle,   tab)]:
+        t = time()              # generate the surrogates in batches
+        for k in range(0, cnt, batch):
+            s = gen(data, min(batch, cnt-k), rng)
+            if gen is shuffle:  # check the columns of the table
+                if (np.sort(s, axis=1) != np.sort(tab, axis=0)).any():
+                    stderr.write('columns are no permutations!\n'); exit(1)
+                continue
+            if (s.sum(axis=2) != mat.sum(axis=1)).any():
+                stderr.write('transaction sizes differ!\n'); exit(1)
+            if gen is swap and (s.sum(axis=1) != mat.sum(axis=0)).any():
+                stderr.write('item frequencies differ!\n'); exit(1)
+        t = time()-t            # print surrogates per second
+        print('%-7s: %8.3fs (%8.2f surrogates/s)' % (name, t, cnt/t))
+    cols = [set(c) for c in tab.T.tolist()]
+    for s in gensurr(tab.tolist(), 's', 4, 1):
+        if any([set(c) != x for c,x in zip(zip(*s), cols)]):
+            stderr.write('items changed their columns!\n'); exit(1)
@@ -0,0 +1,49 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : genpsp.py
+# Contents: benchmark of the scaling of patspec.genpsp() with the
+#           number of processes (surrogate data sets per second)
+#           (needs the coconad and surrogates modules of patspec)
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys             import argv, path, stderr
+from os.path         import join, dirname, abspath
+from random          import seed as srand, random
+from time            import time
+from multiprocessing import cpu_count
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+from patspec         import genpsp
+
+#-----------------------------------------------------------------------
+
+def mktrains (N, dur, rate):
+    '''Create synthetic (Poisson) spike trains.
+N       number of neurons (items)
+dur     duration of the recording (in seconds)
+rate    firing rate of each neuron (in Hz)
+returns a list of pairs (neuron, list of spike times)'''
+    return [(n, sorted([random()*dur for k in range(int(dur*rate))]))
+            for n in range(N)]
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    cnt  = int  (argv[1]) if len(argv) > 1 else 256
+    N    = int  (argv[2]) if len(argv) > 2 else 50
+    dur  = float(argv[3]) if len(argv) > 3 else 10.0
+    rate = float(argv[4]) if len(argv) > 4 else 20.0
+    cmax = int  (argv[5]) if len(argv) > 5 else cpu_count()
+    srand(1)                    # get the benchmark parameters
+    trains = mktrains(N, dur, rate)
+    print('%d surrogate(s), %d neuron(s), %gs, %gHz'
+          % (cnt, N, dur, rate))
+    cpus = [1 << k for k in range(cmax.bit_length()) if 1 << k < cmax]
+    base = None                 # use powers of two up to the maximum
+    for c in cpus +[cmax]:      # traverse the numbers of processes
+        t = time()              # generate a pattern spectrum
+        genpsp(trains, 'c', 2, 0.003, 2, cnt=cnt, seed=1, cpus=c)
+        t = time()-t; sps = cnt/t
+        if base is None: base = sps
+        stderr.write('\n')      # print surrogates per second
+        print('cpus %3d: %8.2f surrogates/s (speedup %5.1fx)'
+              % (c, sps, sps/base))
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : getrec.py
+# Contents: benchmark of the character-wise and the block-wise
+#           record reader of fim+psf+psr.py on a synthetic raster
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys            import argv, stderr
+from os             import remove
+from os.path        import join, dirname, abspath
+from random         import seed as srand, random
+from tempfile       import mkstemp
+from time           import time
+from importlib.util import spec_from_file_location, module_from_spec
+
+#-----------------------------------------------------------------------
+
+def loaddrv ():
+    '''Load the driver script fim+psf+psr.py as a module.
+returns the loaded module'''
+    fn   = join(dirname(abspath(__file__)), '..', 'psf+psr',
+                'fim+psf+psr.py')
+    spec = spec_from_file_location('fimpsfpsr', fn)
+    drv  = module_from_spec(spec)
+    spec.loader.exec_module(drv)
+    return drv                  # load and return the driver module
+
+#-----------------------------------------------------------------------
+
+def mkraster (fname, T, N, rate):
+    '''Write a synthetic activity raster (as written by MATLAB).
+fname   name of the file to write to
+T       number of time bins (transactions)
+N       number of neurons (items)
+rate    probability that a neuron is active in a time bin'''
+    with open(fname, 'w') as out:
+        for t in range(T):      # traverse the time bins
+            for n in range(1, N+1):
+                if random() < rate: out.write('%u ' % n)
+            out.write('\n')     # write the active neurons
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    T    = int  (argv[1]) if len(argv) > 1 else 3600
+    N    = int  (argv[2]) if len(argv) > 2 else 500
+    rate = float(argv[3]) if len(argv) > 3 else 0.05
+    srand(1)                    # get the benchmark parameters
+    drv  = loaddrv()            # and load the driver module
+    fd, fname = mkstemp(suffix='_ACTIVITY-FIM-RASTER.dat')
+    try:                        # create a synthetic raster
+        mkraster(fname, T, N, rate)
+        args = ['\n', ' ,\t', ' \t\r', '#']
+        t = time()              # read character-wise
+        with open(fname, 'rb') as inp:
+            ref = [r for r in iter(lambda: drv.getrec(inp, *args), None)]
+        tc = time()-t
+        t = time()              # read block-wise
+        with open(fname, 'rb') as inp:
+            res = [r for r in drv.getrecs(inp, *args)]
+        tb = time()-t
+    finally:
+        remove(fname)           # delete the synthetic raster
+    if res != ref: stderr.write('records differ!\n'); exit(1)
+    print('%d transaction(s), %d item(s), rate %g' % (T, N, rate))
+    print('getrec  (character-wise): %8.3fs' % tc)
+    print('getrecs (block-wise)    : %8.3fs' % tb)
+    print('speedup                 : %8.1fx' % (tc/tb))
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : patred.py
+# Contents: benchmark of pattern set reduction with patred.patred()
+#           compared to checking all pairs of patterns
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys     import argv, path, stderr
+from os.path import join, dirname, abspath
+from random  import seed as srand, randint, sample
+from bisect  import bisect_left
+from time    import time
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+from patred  import patred, cmpdict
+
+#-----------------------------------------------------------------------
+
+def allpairs (pats, method='S', border=[], addis=False):
+    '''Pattern set reduction checking all pairs of patterns
+(the former implementation of patred.patred(), for comparison).'''
+    patcmp = cmpdict[method]
+    pats = sorted([(len(p),frozenset(p),c) for p,c in pats])
+    pmax = pats[-1][0] if pats else 0
+    if pmax >= len(border):
+        border = border +[0 for i in range(pmax-len(border)+1)]
+    s = [1 for p in pats]
+    for iA in range(len(pats)):
+        zA,A,cA = pats[iA]
+        for iB in range(iA):
+            if not s[iA] and not s[iB]: continue
+            zB,B,cB = pats[iB]
+            P = A & B; zP = len(P)
+            if zP <= 0: continue
+            if zP >= zB:
+                r = patcmp(zA, cA, zB, cB, border)
+                if   r > 0: s[iB] = 0
+                elif r < 0: s[iA] = 0
+                continue
+            cP = max(cA, cB)
+            if not addis or cP < border[zP]: continue
+            iQ = bisect_left(pats, (zP,P,cP))
+            for iQ in range(iQ, len(pats)):
+                zQ,Q,cQ = pats[iQ]
+                if zQ <= zP:
+                    if Q == P: break
+                    continue
+                if P <= Q and patcmp(zQ, cQ, zP, cP, border) < 0:
+                    s[iQ] = 0
+    return [(p[1],p[2]) for p,i in zip(pats,s) if i]
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    cnt    = int(argv[1]) if len(argv) > 1 else 5000
+    N      = int(argv[2]) if len(argv) > 2 else 500
+    method = argv[3]      if len(argv) > 3 else 'S'
+    addis  = len(argv) > 4 and argv[4] != '0'
+    srand(1)                    # create synthetic patterns
+    pats   = [(tuple(sample(range(N), randint(2, 6))), randint(2, 20))
+              for k in range(cnt)]
+    border = [0, 0] +[max(2, 12-2*z) for z in range(2, 10)]
+    print('%d pattern(s), %d item(s), method %s%s'
+          % (cnt, N, method, ', intersections' if addis else ''))
+    res = []                    # reduce the pattern set
+    for name, red in [('all pairs', allpairs), ('patred', patred)]:
+        t = time(); res.append(red(pats, method, border, addis))
+        print('%-14s: %8.3fs (%d pattern(s))'
+              % (name, time()-t, len(res[-1])))
+    if res[0] != res[1]: stderr.write('results differ!\n'); exit(1)
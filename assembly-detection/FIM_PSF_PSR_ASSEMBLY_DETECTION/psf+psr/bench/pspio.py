@@ -0,0 +1,40 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : pspio.py
+# Contents: benchmark of reading and writing pattern spectra
+#           as text files and as binary files (patspec.pspbread())
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys      import argv, path, stderr
+from os       import remove
+from os.path  import join, dirname, abspath
+from random   import seed as srand, randint
+from tempfile import mkstemp
+from time     import time
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+from patspec  import pspread, pspwrite, PSPBIN
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    zmax = int(argv[1]) if len(argv) > 1 else 40
+    cmax = int(argv[2]) if len(argv) > 2 else 5000
+    cnt  = int(argv[3]) if len(argv) > 3 else 1000
+    srand(1)                    # get the benchmark parameters
+    norm = 1.0/float(cnt)       # create a (dense) pattern spectrum
+    psp  = dict([((z,c), randint(1, 100*cnt)*norm)
+                 for z in range(2, zmax+1) for c in range(2, cmax+1)
+                 if randint(0, 1)])
+    print('%d signature(s)' % len(psp))
+    for ext in ['.psp', PSPBIN]:
+        fd, fname = mkstemp(suffix=ext)
+        try:                    # write and read the spectrum
+            t = time(); pspwrite(psp, fname, info={'cnt': cnt})
+            tw = time()-t
+            t = time(); res = pspread(fname)
+            tr = time()-t
+        finally:
+            remove(fname)       # delete the spectrum file
+        if ext == PSPBIN and res != psp:
+            stderr.write('pattern spectra differ!\n'); exit(1)
+        print('%-5s: write %8.3fs, read %8.3fs' % (ext, tw, tr))
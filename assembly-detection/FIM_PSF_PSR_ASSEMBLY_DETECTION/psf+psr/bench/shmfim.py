@@ -0,0 +1,40 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : shmfim.py
+# Contents: benchmark of passing the transactions to the processes of
+#           patspec.fimpsp() in shared memory or as process arguments
+#           (needs the compiled fim module)
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys             import argv, path, stderr
+from os.path         import join, dirname, abspath
+from random          import seed as srand, random
+from time            import time
+from multiprocessing import cpu_count, set_start_method
+path.insert(0, join(dirname(abspath(__file__)), '..', 'fim'))
+import patspec
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    T      = int  (argv[1]) if len(argv) > 1 else 100000
+    N      = int  (argv[2]) if len(argv) > 2 else 100
+    rate   = float(argv[3]) if len(argv) > 3 else 0.02
+    cpus   = int  (argv[4]) if len(argv) > 4 else cpu_count()
+    method = argv[5]        if len(argv) > 5 else 'spawn'
+    set_start_method(method)    # get the benchmark parameters
+    srand(1)                    # create a synthetic raster
+    tracts = [tuple([n for n in range(N) if random() < rate])
+              for t in range(T)]
+    print('%d transaction(s), %d item(s), rate %g, %d cpus, %s'
+          % (T, N, rate, cpus, method))
+    shm = patspec.SharedMemory  # one surrogate per process,
+    res = []                    # so that the startup dominates
+    for name, s in [('arguments', None), ('shared memory', shm)]:
+        patspec.SharedMemory = s
+        t = time()              # generate a pattern spectrum
+        res.append(patspec.fimpsp(tracts, 's', -T//1000, 2, -1, '#',
+                                  cpus, 'p', 1, cpus))
+        stderr.write('\n')      # print the time
+        print('%-13s: %8.3fs' % (name, time()-t))
+    if res[0] != res[1]: stderr.write('spectra differ!\n'); exit(1)
@@ -0,0 +1,174 @@
+#!/usr/bin/python
+#-----------------------------------------------------------------------
+# File    : fimsurr.py
+# Contents: surrogate data generation for transactional data
+#           (binary T x N rasters, vectorized with numpy)
+# History : 2026.10.18 file created
+#-----------------------------------------------------------------------
+from sys   import argv
+from math  import ceil, log
+import numpy as np
+
+#-----------------------------------------------------------------------
+# Functions
+#-----------------------------------------------------------------------
+
+def tracts2mat (tracts, n=0):
+    '''tracts2mat (tracts, n=0)
+Convert a transaction database into a binary matrix (raster).
+tracts  transaction database (list or tuple of transactions);
+        each transaction must be a list or a tuple of integer items
+        in the range 0 to n-1
+n       number of items (columns of the matrix)
+        (n <= 0: determine from the maximum item)
+returns a boolean matrix of shape (T, N) with T the number of
+        transactions and N the number of items'''
+    lens = np.fromiter((len(t) for t in tracts), np.int64, len(tracts))
+    cols = np.fromiter((i for t in tracts for i in t), np.int64,
+                       int(lens.sum()))
+    if n <= 0: n = int(cols.max())+1 if len(cols) else 0
+    mat  = np.zeros((len(tracts), n), dtype=bool)
+    mat[np.repeat(np.arange(len(tracts)), lens), cols] = True
+    return mat                  # set the items of the transactions
+
+#-----------------------------------------------------------------------
+
+def mat2tracts (mat):
+    '''mat2tracts (mat)
+Convert a binary matrix (raster) into a transaction database.
+mat     boolean matrix of shape (T, N)
+returns a list of T transactions (tuples of integer items)'''
+    rows, cols = np.nonzero(mat)# collect the set cells row by row
+    ends = np.cumsum(np.bincount(rows, minlength=mat.shape[0]))
+    return [tuple(t.tolist()) for t in np.split(cols, ends)[:len(ends)]]
+
+#-----------------------------------------------------------------------
+
+def randomize (mat, cnt=1, rng=None):
+    '''randomize (mat, cnt=1, rng=None)
+Generate random transactions with the sizes of the original
+transactions and items drawn with their relative frequencies.
+mat     boolean matrix of shape (T, N) (see tracts2mat())
+cnt     number of surrogate data sets to generate
+rng     numpy random number generator (default: new generator)
+returns a boolean array of shape (cnt, T, N)
+
+The items of each transaction are drawn without replacement with
+probabilities proportional to the item frequencies (Gumbel top-k
+sampling, i.e. the k items with the largest perturbed log-weights).'''
+    if rng is None: rng = np.random.default_rng()
+    T, N = mat.shape            # get the transaction sizes and
+    size = mat.sum(axis=1)      # the logarithms of item frequencies
+    with np.errstate(divide='ignore'):
+        wgt = np.log(mat.sum(axis=0).astype(np.float64))
+    keys = wgt +rng.gumbel(size=(cnt, T, N))
+    srt  = -np.sort(-keys, axis=2)  # find the k-th largest key per row
+    thr  = srt[:, np.arange(T), np.maximum(size-1, 0)]
+    thr[:, size == 0] = np.inf  # (empty transactions stay empty)
+    return keys >= thr[:,:,None]
+
+#-----------------------------------------------------------------------
+
+def swap (mat, cnt=1, rng=None, rounds=0):
+    '''swap (mat, cnt=1, rng=None, rounds=0)
+Generate surrogate data sets that preserve both the transaction sizes
+and the item frequencies (swap randomization, curveball algorithm).
+mat     boolean matrix of shape (T, N) (see tracts2mat())
+cnt     number of surrogate data sets to generate
+rng     numpy random number generator (default: new generator)
+rounds  number of rounds of trades between transactions
+        (rounds <= 0: 2*ceil(log2(T)) rounds)
+returns a boolean array of shape (cnt, T, N)
+
+In each round the transactions are paired randomly; for each pair the
+items contained in only one of the transactions are pooled and dealt
+out again randomly, with each transaction keeping its number of such
+items (curveball trade). All pairs of all surrogates are traded at
+once with a few array operations.'''
+    if rng is None: rng = np.random.default_rng()
+    T, N = mat.shape            # get the matrix dimensions
+    if rounds <= 0: rounds = 2*int(ceil(log(max(T, 2), 2)))
+    X = np.array(np.broadcast_to(mat, (cnt, T, N)))
+    m = T//2                    # number of pairs per round
+    if m <= 0: return X         # (no trades possible)
+    for r in range(rounds):     # execute the trading rounds
+        prm = np.argsort(rng.random((cnt, T)), axis=1)
+        a = prm[:, 0:2*m:2, None]   # pair the transactions randomly
+        b = prm[:, 1:2*m:2, None]
+        A = np.take_along_axis(X, a, axis=1)
+        B = np.take_along_axis(X, b, axis=1)
+        S = A & B; D = A ^ B    # get shared and traded items
+        n = (A & ~B).sum(axis=2)    # items traded away by the first
+        keys = np.where(D, rng.random(D.shape), -1.0)
+        srt  = -np.sort(-keys, axis=2)
+        thr  = np.take_along_axis(srt, np.maximum(n-1, 0)[:,:,None], 2)
+        thr[n == 0] = np.inf    # deal out the traded items randomly
+        toa  = D & (keys >= thr)
+        np.put_along_axis(X, a, S |  toa,      axis=1)
+        np.put_along_axis(X, b, S | (D & ~toa), axis=1)
+    return X                    # return the surrogate data sets
+
+#-----------------------------------------------------------------------
+
+def shuffle (tab, cnt=1, rng=None):
+    '''shuffle (tab, cnt=1, rng=None)
+Generate surrogate data sets for table-derived data by shuffling the
+columns of the table independently.
+tab     integer array of shape (T, C) with the items of the
+        transactions (all transactions must have the same size C
+        and every item must occur in only one column)
+cnt     number of surrogate data sets to generate
+rng     numpy random number generator (default: new generator)
+returns an integer array of shape (cnt, T, C)'''
+    if rng is None: rng = np.random.default_rng()
+    tab = np.asarray(tab)       # permute each column independently
+    idx = np.argsort(rng.random((cnt,) +tab.shape), axis=1)
+    return np.take_along_axis(np.broadcast_to(tab, idx.shape), idx, 1)
+
+#-----------------------------------------------------------------------
+
+def gensurr (tracts, surr='p', cnt=1000, seed=0, batch=16, rounds=0):
+    '''gensurr (tracts, surr='p', cnt=1000, seed=0, batch=16, rounds=0)
+Generate surrogate data sets of a transaction database.
+tracts  transaction database (list or tuple of transactions);
+        each transaction must be a list or a tuple of integer items
+surr    surrogate data generation method       (default: p)
+        (for s the items of a transaction must be in the order
+        of the columns of the table, e.g. in record order)
+        i    ident      identity (keep original data)
+        r    random     random transaction generation
+        p    swap       permutation by pair swaps
+        s    shuffle    shuffle table-derived data (columns)
+cnt     number of surrogate data sets          (default: 1000)
+seed    seed for random number generator       (default: 0)
+        (seed = 0: use system entropy as a seed)
+batch   number of surrogate data sets generated together
+rounds  number of rounds for swap randomization (see swap())
+returns a generator of surrogate data sets (lists of transactions)'''
+    if surr == 'i':             # identity: keep original data
+        yield list(tracts); return
+    rng = np.random.default_rng(seed if seed != 0 else None)
+    if surr == 's':             # shuffle table-derived data
+        tab = np.array([tuple(t) for t in tracts], dtype=np.int64)
+        tab = tab.reshape(len(tracts), -1 if len(tracts) else 0)
+    else:                       # convert transactions to a raster
+        mat = tracts2mat(tracts)
+    for k in range(0, cnt, batch):  # generate the surrogates in batches
+        b = min(batch, cnt-k)   # get the size of the batch
+        if   surr == 's':       # shuffle columns (table-derived data)
+            for s in shuffle(tab, b, rng).tolist():
+                yield [tuple(t) for t in s]
+        elif surr == 'r':       # random transaction generation
+            for s in randomize(mat, b, rng): yield mat2tracts(s)
+        else:                   # permutation by pair swaps
+            for s in swap(mat, b, rng, rounds): yield mat2tracts(s)
+
+#-----------------------------------------------------------------------
+
+if __name__ == '__main__':
+    tracts = [[int(i) for i in l.split()] for l in open(argv[1])]
+    surr   = argv[2]      if len(argv) > 2 else 'p'
+    cnt    = int(argv[3]) if len(argv) > 3 else 1
+    for s in gensurr(tracts, surr, cnt, 1):
+        for t in s: print(' '.join([str(i) for i in t]))
+        print('')               # print the surrogate data sets
@@ -16,8 +16,21 @@
 #           2014.07.01 range check for detection border added
 #           2014.11.07 bug in red_items2() fixed (iA,iB exchanged)
 #           2015.08.12 redesigned with pattern comparison functions
+#           2026.10.18 inverted index to check only overlapping patterns
+#           2026.10.18 vectorized comparison functions (patvec())
+#           2026.10.18 border padded for the excess item tests (zB = 1)
 #-----------------------------------------------------------------------
 from bisect import bisect_left
+try:                            # numpy is only needed for
+    import numpy as np          # the vectorized comparisons
+except ImportError:
+    np = None
+
+#-----------------------------------------------------------------------
+# Constants
+#-----------------------------------------------------------------------
+PAIRS  = 1 << 20                # maximum pattern pairs compared at once
+VECMIN = 64                     # minimum patterns for vectorized comparison
 
 #-----------------------------------------------------------------------
 
@@ -209,6 +222,211 @@ cmpdict = {'x': red_none,
            'l': red_leni0,   'L': red_leni1,
            't': red_strict0, 'T': red_strict1}
 
+#-----------------------------------------------------------------------
+# Vectorized Pattern Comparison Functions
+#-----------------------------------------------------------------------
+
+def vec_none (zA, cA, zB, cB, border):
+    '''vec_none (zA, cA, zB, cB, border)
+Vectorized version of red_none(): never prefer any pattern.
+zA, cA, zB, cB  numpy arrays of pattern sizes and supports
+border  detection border as a numpy array of minimum support values
+returns a numpy array of preferences (+1, -1 or 0, see red_none())'''
+    return np.zeros(np.broadcast(zA, cA, zB, cB).shape, dtype=np.int64)
+
+#-----------------------------------------------------------------------
+
+def vec_coins0 (zA, cA, zB, cB, border):
+    '''vec_coins0 (zA, cA, zB, cB, border)
+Vectorized version of red_coins0() (see there).'''
+    return np.where((cA >= cB) | (cB -cA < border[zB]), +1, -1)
+
+#-----------------------------------------------------------------------
+
+def vec_coins1 (zA, cA, zB, cB, border):
+    '''vec_coins1 (zA, cA, zB, cB, border)
+Vectorized version of red_coins1() (see there).'''
+    return np.where((cA >= cB) | (cB -cA +1 < border[zB]), +1, -1)
+
+#-----------------------------------------------------------------------
+
+def vec_items2 (zA, cA, zB, cB, border):
+    '''vec_items2 (zA, cA, zB, cB, border)
+Vectorized version of red_items2() (see there).'''
+    xA = cA < border[zA-zB+2]
+    return np.where((cA >= cB) | ~xA, +1, -1)
+
+#-----------------------------------------------------------------------
+
+def vec_cover0 (zA, cA, zB, cB, border):
+    '''vec_cover0 (zA, cA, zB, cB, border)
+Vectorized version of red_cover0() (see there).'''
+    return np.where((cA >= cB) | (zA*cA >= zB*cB), +1, -1)
+
+#-----------------------------------------------------------------------
+
+def vec_cover1 (zA, cA, zB, cB, border):
+    '''vec_cover1 (zA, cA, zB, cB, border)
+Vectorized version of red_cover1() (see there).'''
+    return np.where((cA >= cB) | ((zA-1)*cA >= (zB-1)*cB), +1, -1)
+
+#-----------------------------------------------------------------------
+
+def vec_excess (zA, cA, zB, cB, border, cover, keep):
+    '''vec_excess (zA, cA, zB, cB, border, cover, keep)
+Vectorized version of red_leni0/1() and red_strict0/1().
+zA, cA, zB, cB  numpy arrays of pattern sizes and supports
+border  detection border as a numpy array of minimum support values
+cover   whether pattern A covers at least as many points/spikes
+keep    whether to keep both patterns if neither excess rejects
+returns a numpy array of preferences (+1, -1 or 0)'''
+    xA = cA < border[zA-zB+2]
+    xB = cB-cA+1 < border[zB]   # excess items/coins. explainable
+    r  = np.where(cover, +1, -1)# compare number of covered spikes
+    if keep: r = np.where(xA | xB, r, 0)
+    r  = np.where(xA & ~xB, -1, np.where(~xA & xB, +1, r))
+    return np.where(cA >= cB, +1, r)
+
+#-----------------------------------------------------------------------
+
+def vec_leni0 (zA, cA, zB, cB, border):
+    '''vec_leni0 (zA, cA, zB, cB, border)
+Vectorized version of red_leni0() (see there).'''
+    return vec_excess(zA, cA, zB, cB, border, zA*cA >= zB*cB, True)
+
+#-----------------------------------------------------------------------
+
+def vec_leni1 (zA, cA, zB, cB, border):
+    '''vec_leni1 (zA, cA, zB, cB, border)
+Vectorized version of red_leni1() (see there).'''
+    return vec_excess(zA, cA, zB, cB, border,
+                      (zA-1)*cA >= (zB-1)*cB, True)
+
+#-----------------------------------------------------------------------
+
+def vec_strict0 (zA, cA, zB, cB, border):
+    '''vec_strict0 (zA, cA, zB, cB, border)
+Vectorized version of red_strict0() (see there).'''
+    return vec_excess(zA, cA, zB, cB, border, zA*cA >= zB*cB, False)
+
+#-----------------------------------------------------------------------
+
+def vec_strict1 (zA, cA, zB, cB, border):
+    '''vec_strict1 (zA, cA, zB, cB, border)
+Vectorized version of red_strict1() (see there).'''
+    return vec_excess(zA, cA, zB, cB, border,
+                      (zA-1)*cA >= (zB-1)*cB, False)
+
+#-----------------------------------------------------------------------
+
+cmpvecs = {red_none:    vec_none,
+           red_coins0:  vec_coins0,  red_coins1:  vec_coins1,
+           red_items2:  vec_items2,
+           red_cover0:  vec_cover0,  red_cover1:  vec_cover1,
+           red_leni0:   vec_leni0,   red_leni1:   vec_leni1,
+           red_strict0: vec_strict0, red_strict1: vec_strict1}
+
+#-----------------------------------------------------------------------
+
+def ovlpairs (pos, rank, lo, hi, n):
+    '''ovlpairs (pos, rank, lo, hi, n)
+Find the pairs of patterns that share at least one item.
+pos     numpy array with the indices of the patterns containing
+        each item, grouped by item (an inverted index)
+rank    numpy array with the position of each entry of pos
+        within the group of its item
+lo, hi  index range of the (larger) patterns A
+n       number of patterns
+returns a triplet (a, b, z) of numpy arrays with the indices of the
+        patterns A (lo <= a < hi) and B (b < a) and the size z of
+        their intersection, sorted by a and then b'''
+    sel  = (pos >= lo) & (pos < hi)
+    r    = rank[sel]            # get the entries of the patterns A
+    tot  = int(r.sum())         # and the preceding entries (patterns B)
+    beg  = np.repeat(np.flatnonzero(sel) -r, r)
+    off  = np.arange(tot) -np.repeat(np.cumsum(r) -r, r)
+    keys = np.repeat(pos[sel], r) *n +pos[beg +off]
+    keys, z = np.unique(keys, return_counts=True)
+    return keys // n, keys % n, z
+
+#-----------------------------------------------------------------------
+
+def patvec (pats, patcmp, border, addis=False):
+    '''patvec (pats, patcmp, border, addis=False)
+Compute the selector flags of pattern set reduction with numpy.
+pats    sorted list of patterns as triplets (size, item set, support)
+patcmp  pattern comparison function (must be a key of cmpvecs)
+border  detection border as a list of minimum support values per size
+addis   whether to add intersections of patterns
+returns a list of selector flags (1: keep pattern, 0: remove it)
+
+The pairs of patterns that share items are found with an inverted
+index and all subset pairs are compared with the vectorized version
+of the comparison function; only pairs that can change a flag are
+traversed (in the same order as in patred()) to add intersections.'''
+    n    = len(pats)            # get the number of patterns
+    vec  = cmpvecs[patcmp]      # and the vectorized comparison
+    zs   = np.array([p[0] for p in pats], dtype=np.int64)
+    cs   = np.array([p[2] for p in pats])
+    bdr  = np.asarray(border)   # get sizes, supports and border
+    code = dict(); items = []; ids = []
+    for k,(z,P,c) in enumerate(pats):
+        for i in P: items.append(code.setdefault(i, len(code)))
+        ids.extend([k]*z)       # code the items of the patterns
+    items = np.array(items, dtype=np.int64)
+    ids   = np.array(ids,   dtype=np.int64)
+    order = np.lexsort((ids, items))
+    items = items[order]        # build an inverted index
+    pos   = ids  [order]        # (pattern indices grouped by items)
+    rank  = np.arange(len(pos)) -np.searchsorted(items, items, 'left')
+    wgt   = np.cumsum(np.bincount(pos, weights=rank, minlength=n))
+    s     = np.ones(n, dtype=bool) # initialize the selector flags
+    if addis:                   # prepare adding intersections
+        offs = np.searchsorted(items, np.arange(len(code)+1))
+        ends = dict([(z,k+1) for k,(z,P,c) in enumerate(pats)])
+        locs = dict()           # note the locations of the item sets
+        for k,p in enumerate(pats): locs.setdefault(p[1], []).append(k)
+        done = set(); flags = [1 for p in pats]
+    lo = 0                      # traverse the (sorted) patterns
+    while lo < n:               # in chunks of pattern pairs
+        hi = max(int(np.searchsorted(wgt, wgt[lo-1] +PAIRS if lo else
+                                     PAIRS, 'right')), lo+1)
+        a, b, z = ovlpairs(pos, rank, lo, hi, n)
+        sub = z >= zs[b]        # find the subset pairs and
+        res = np.zeros(len(a), dtype=np.int64)  # compare them
+        res[sub] = vec(zs[a[sub]], cs[a[sub]], zs[b[sub]], cs[b[sub]],
+                       bdr)     # (all pairs at once)
+        lo = hi                 # go to the next chunk
+        if not addis:           # without intersections the order
+            s[b[res > 0]] = False   # of the comparisons is irrelevant
+            s[a[res < 0]] = False
+            continue            # unmark the disfavored patterns
+        cP  = np.maximum(cs[a], cs[b])
+        sel = np.where(sub, res != 0, cP >= bdr[z])
+        for iA, iB, zP, cP, r in zip(a[sel].tolist(), b[sel].tolist(),
+            z[sel].tolist(), cP[sel].tolist(), res[sel].tolist()):
+            if not flags[iA] and not flags[iB]: continue
+            if   r > 0: flags[iB] = 0; continue # unmark the
+            elif r < 0: flags[iA] = 0; continue # disfavored pattern
+            P = pats[iA][1] & pats[iB][1]
+            if (P,cP) in done: continue
+            done.add((P,cP))    # (filtering again changes nothing)
+            iQ = bisect_left(pats, (zP,P,cP))
+            if any([iQ <= i < ends[zP] for i in locs.get(P, [])]):
+                continue        # skip intersections that are patterns
+            k  = min([code[i] for i in P],
+                     key=lambda k: offs[k+1]-offs[k])
+            qs = pos[offs[k]:offs[k+1]] # get patterns sharing
+            if len(qs) < VECMIN:        # the rarest item and compare
+                qs = [q for q in qs.tolist() if pats[q][0] > zP and
+                      patcmp(pats[q][0], pats[q][2], zP,cP, border) < 0]
+            else:               # (few patterns directly,
+                qs = qs[zs[qs] > zP]    # many patterns vectorized)
+                qs = qs[vec(zs[qs], cs[qs], zP, cP, bdr) < 0].tolist()
+            for q in qs:        # traverse the disfavored supersets
+                if P <= pats[q][1]: flags[q] = 0
+    return flags if addis else s.astype(int).tolist()
+
 #-----------------------------------------------------------------------
 
 def patred (pats, method='S', border=[], addis=False):
@@ -221,7 +439,16 @@ method  index or identifier of pattern comparison method or
         a pattern comparison function patcmp(zA, cA, zB, cB, border)
 border  detection border as a list of minimum support values per size
 addis   whether to add intersections of patterns
-returns a reduced set of patterns'''
+returns a reduced set of patterns
+
+The border is padded with zeros (no restriction) to the length pmax+2
+(pmax: size of the largest pattern), because the tests of excess items
+access the border at index zA-zB+2 <= pmax+1. The comparison functions
+rely on this in both the plain and the vectorized version.
+
+With numpy the built-in comparison functions are evaluated for many
+pattern pairs at once (see patvec()), otherwise pattern pairs that
+share items are compared one by one with the comparison function.'''
     if isinstance(method, (0).__class__): patcmp = cmpfns [method]
     elif method in cmpdict:               patcmp = cmpdict[method]
     else:                                 patcmp = method
@@ -230,16 +457,30 @@ returns a reduced set of patterns'''
     pats = [(len(p),frozenset(p),c) for p,c in pats]
     pats = sorted(pats)         # prepare patterns (turn into sets)
     pmax = pats[-1][0] if pats else 0
-    if pmax >= len(border):     # prepare and sort patterns
-        border = border +[0 for i in range(pmax-len(border)+1)]
+    if pmax+2 > len(border):    # pad the border with zeros
+        border = border +[0 for i in range(pmax+2-len(border))]
+    if np is not None and patcmp in cmpvecs:
+        s = patvec(pats, patcmp, border, addis)
+        return [(p[1],p[2]) for p,i in zip(pats,s) if i]
+    idx = dict()                # build an inverted index, i.e. a map
+    for k,(z,P,c) in enumerate(pats):  # from the items to the (sorted)
+        for i in P: idx.setdefault(i, []).append(k)   # patterns
+    ends = dict([(z,k+1) for k,(z,P,c) in enumerate(pats)])
+    locs = dict()               # note the locations of the item sets
+    for k,(z,P,c) in enumerate(pats): locs.setdefault(P, []).append(k)
     s = [1 for p in pats]       # initialize the selector flags
+    done = set()                # intersections already used to filter
     for iA in range(len(pats)): # traverse the (sorted) patterns
         zA,A,cA = pats[iA]      # get the next pattern
-        for iB in range(iA):    # check against subsets
+        cnts = dict()           # count the items shared with subsets
+        for i in A:             # (only patterns that share items
+            for iB in idx[i]:   # with pattern A need to be checked)
+                if iB >= iA: break
+                cnts[iB] = cnts.get(iB, 0) +1
+        for iB in sorted(cnts): # check against subsets
             if not s[iA] and not s[iB]: continue
             zB,B,cB = pats[iB]  # get the next pattern
-            P = A & B; zP = len(P)
-            if zP <= 0: continue# compute pattern intersection
+            zP = cnts[iB]       # get the size of the intersection
             if zP >= zB:        # if pattern B is subset of A
                 r = patcmp(zA, cA, zB, cB, border)
                 if   r > 0: s[iB] = 0  # compare patterns and
@@ -247,12 +488,15 @@ returns a reduced set of patterns'''
                 continue        # if the intersection is proper:
             cP = max(cA, cB)    # get its support estimate
             if not addis or cP < border[zP]: continue
+            P  = A & B          # compute pattern intersection
+            if (P,cP) in done: continue
+            done.add((P,cP))    # (filtering again changes nothing)
             iQ = bisect_left(pats, (zP,P,cP))
-            for iQ in range(iQ, len(pats)):
-                zQ,Q,cQ = pats[iQ]
-                if zQ <= zP:    # traverse remaining patterns
-                    if Q == P: break
-                    continue    # skip smaller patterns
+            if any([iQ <= k < ends[zP] for k in locs.get(P, [])]):
+                continue        # skip intersections that are patterns
+            for iQ in min([idx[i] for i in P], key=len):
+                zQ,Q,cQ = pats[iQ]  # traverse the patterns that
+                if zQ <= zP: continue   # share the rarest item
                 if P <= Q and patcmp(zQ, cQ, zP, cP, border) < 0:
                     s[iQ] = 0   # filter with intersection
     return [(p[1],p[2]) for p,i in zip(pats,s) if i]
@@ -11,41 +11,396 @@
 #           2014.06.10 parameter supp added to function psp2bdr()
 #           2014.10.11 argument order for patspec() changed
 #           2015.08.13 function patspec() renamed to genpsp()
+#           2026.10.18 imports for genpsp() made optional
+#           2026.10.18 surrogates generated in batches by a process pool
+#           2026.10.18 partial spectra packed into arrays (psppack())
+#           2026.10.18 seed per surrogate data set (surrseed()) added
+#           2026.10.18 function fimpsp() for transactional data added
+#           2026.10.18 surrogate ranges and shard files (shdwrite() etc.)
+#           2026.10.18 pattern spectrum cache (pspkey(), cacheget() etc.)
+#           2026.10.18 checkpoints to resume/extend generation (pspgen())
+#           2026.10.18 adaptive early stopping (border stable/time budget)
+#           2026.10.18 class PatternSpectrum added, psp2bdr() made O(n)
+#           2026.10.18 binary pattern spectrum files (pspbread() etc.)
+#           2026.10.18 per-signature histograms and borders (hst2bdr())
+#           2026.10.18 input data passed to workers in shared memory
+#           2026.10.18 function estpsp() added (vectorized estimation)
+#           2026.10.18 fimpsp() without the fim module (fimsurr, pyfim)
 #-----------------------------------------------------------------------
-from sys             import argv, stderr, path
-from os.path         import join
+from sys             import argv, stderr, path, byteorder, float_info
+from os              import listdir, remove, replace, utime, fdopen
+from os              import close
+from os              import makedirs
+from os.path         import join, getsize, getmtime, isfile
+from os.path         import dirname, abspath
+from tempfile        import mkstemp
+from hashlib         import sha256
+from struct          import Struct
+from mmap            import mmap, ACCESS_READ
 from random          import seed as srand
 from time            import time
-from math            import floor, ceil
-from multiprocessing import Process, Queue, Value, cpu_count
+from math            import floor, ceil, log, exp, sqrt, lgamma
+from itertools       import permutations
+from array           import array
+from multiprocessing import Pool, cpu_count
 NEURODIR = join('..', 'neuro')
 if NEURODIR not in path: path.insert(0, NEURODIR)
-from surrogates      import getrandfn, getsurrfn
+try:                            # surrogates and coconad are only
+    from surrogates  import getrandfn, getsurrfn  # needed for genpsp()
+except ImportError:             # (pattern spectrum functions like
+    getrandfn = getsurrfn = None    # psp2bdr() work without them)
 try:
     from coco    import coconad
 except ImportError:
     COCODIR = join('..', 'coconad')
     if COCODIR not in path: path.insert(0, COCODIR)
-    from coconad import coconad
+    try:
+        from coconad import coconad
+    except ImportError:
+        coconad = None
+try:                            # the fim module is only needed
+    from fim     import genpsp as fimgen    # for fimpsp()
+except ImportError:
+    fimgen = None
+try:                            # without the fim module, fimpsp()
+    from fimsurr import gensurr # generates surrogates with numpy
+    from pyfim   import fim as pyfim    # and mines them in Python
+except ImportError:
+    gensurr = pyfim = None
+try:                            # numpy is only needed
+    import numpy as np          # for the class PatternSpectrum
+except ImportError:
+    np = None
+try:                            # shared memory is used (if available)
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:             # to pass the data to the processes
+    SharedMemory = None
 
 #-----------------------------------------------------------------------
 # Constants
 #-----------------------------------------------------------------------
 oo = float('inf')               # positive infinity as a constant
+BATCH = 16                      # maximum number of surrogates per batch
+CKPT  = 60.0                    # time between checkpoints (in seconds)
+MASK  = (1 << 64) -1            # mask for 64 bit integer arithmetic
+DENSE = 4                       # maximum array cells per signature
+PSPBIN = '.pspb'                # extension of binary spectrum files
+PSPVER = 1                      # version of the binary file format
+PSPHDR = Struct('<4sHHIQ')      # magic, version, kind, info, entries
 
 #-----------------------------------------------------------------------
 # Functions
 #-----------------------------------------------------------------------
 
-def psproc (trains, surrfn, randfn, beg, end, delta,
-            target, supp, width, zmin, zmax, seed,
-            cnt, queue, done):
-    '''psproc (trains, surrfn, randfn, beg, end, delta
-        target, supp, width, zmin, zmax, cnt, queue, done)
-Function for multiprocessing pattern spectrum generation.
+def psppack (patspec):
+    '''psppack (patspec)
+Pack a (partial) pattern spectrum into compact arrays.
+patspec pattern spectrum as a dictionary mapping pattern signatures
+        (size, support) to occurrence counters
+returns a triplet (sizes, supps, cnts) of arrays, which can be sent
+        to another process much faster than a dictionary'''
+    sigs = sorted(patspec)      # sort the pattern signatures
+    return (array('i', [z for z,c in sigs]),
+            array('i', [c for z,c in sigs]),
+            array('d', [patspec[s] for s in sigs]))
+
+#-----------------------------------------------------------------------
+
+def pspunpack (part, norm=1.0):
+    '''pspunpack (part, norm=1.0)
+Unpack a packed (partial) pattern spectrum into a dictionary.
+part    triplet (sizes, supps, cnts) of arrays, memory views or numpy
+        arrays (as created by psppack() or returned by pspbread())
+norm    factor with which the occurrence counters are multiplied
+returns the pattern spectrum as a dictionary mapping pattern
+        signatures (size, support) to occurrence counters (floats)'''
+    z, c, n = [a.tolist() for a in part]
+    return dict(zip(zip(z, c), [v*norm for v in n]))
+
+#-----------------------------------------------------------------------
+
+def pspadd (patspec, part):
+    '''pspadd (patspec, part)
+Add a packed (partial) pattern spectrum to a pattern spectrum.
+patspec pattern spectrum as a dictionary mapping pattern signatures
+        (size, support) to occurrence counters or as a PatternSpectrum
+        object (modified in place)
+part    packed pattern spectrum as created by psppack()
+returns the extended pattern spectrum'''
+    if not isinstance(patspec, dict):
+        return patspec.add(part)# add arrays to a PatternSpectrum
+    for z,c,n in zip(*part):    # traverse the pattern signatures
+        s = (z,c)               # and sum the occurrence counters
+        patspec[s] = patspec.get(s, 0) +n
+    return patspec              # return the extended pattern spectrum
+
+#-----------------------------------------------------------------------
+
+def hstpack (hist):
+    '''hstpack (hist)
+Pack (partial) per-signature histograms into compact arrays.
+hist    dictionary mapping pattern signatures (size, support) to
+        histograms, each a dictionary mapping an occurrence counter k
+        to the number of surrogate data sets with k such patterns
+returns a quadruplet (sizes, supps, ks, cnts) of arrays'''
+    ents = sorted([(z,c,k,f) for (z,c),h in hist.items()
+                             for k,f in h.items()])
+    return (array('i', [e[0] for e in ents]),
+            array('i', [e[1] for e in ents]),
+            array('q', [e[2] for e in ents]),
+            array('q', [e[3] for e in ents]))
+
+#-----------------------------------------------------------------------
+
+def hstadd (hist, part):
+    '''hstadd (hist, part)
+Add packed (partial) per-signature histograms to histograms.
+hist    dictionary mapping pattern signatures to histograms
+        (see hstpack(), modified in place)
+part    packed histograms as created by hstpack()
+returns the extended histograms'''
+    for z,c,k,f in zip(*part):  # traverse the histogram entries
+        h = hist.setdefault((z,c), dict())
+        h[k] = h.get(k, 0) +f   # sum the numbers of surrogates
+    return hist                 # return the extended histograms
+
+#-----------------------------------------------------------------------
+
+def surrseed (seed, k):
+    '''surrseed (seed, k)
+Compute the seed for the random number generator for a surrogate
+data set from a master seed and the index of the surrogate data set
+(SplitMix64 finalizer applied to the combined values).
+seed    master seed (as passed to genpsp() or fimpsp())
+k       index of the surrogate data set (0-based)
+returns a seed in the range 1 to 2**32-1 (32 bit, since it is also
+        used for the random number generator of the fim module)'''
+    x = (int(seed) * 0x9e3779b97f4a7c15 +k +1) & MASK
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & MASK
+    x = (x ^ (x >> 31)) & 0xffffffff
+    return x if x else 1        # return a non-zero 32 bit seed
+
+#-----------------------------------------------------------------------
+
+def rngjoin (rngs):
+    '''rngjoin (rngs)
+Combine ranges of surrogate data sets.
+rngs    iterable of pairs (a,b) of ranges of surrogate data sets
+        (the data sets a to b-1, as in the header of a shard)
+returns a sorted list of disjoint ranges (adjacent ranges combined)
+raises  ValueError if some of the ranges overlap'''
+    res = []                    # initialize the combined ranges
+    for a,b in sorted(rngs):    # traverse the (sorted) ranges
+        if a >= b: continue     # skip empty ranges
+        if res and a < res[-1][1]:
+            raise ValueError('ranges overlap in %d:%d' % (a,b))
+        if res and a == res[-1][1]: res[-1] = (res[-1][0], b)
+        else:                       res.append((a,b))
+    return res                  # return the combined ranges
+
+#-----------------------------------------------------------------------
+
+def psprun (init, args, proc, rngs, seed, cpus, psp=None, ckpt=None,
+            stop=None, hist=None):
+    '''psprun (init, args, proc, rngs, seed, cpus, psp=None, ckpt=None,
+        stop=None, hist=None)
+Generate surrogate data sets in batches and sum their spectra.
+init    function to initialize a process (psinit() or fiminit())
+args    arguments of the initialization function
+proc    function to process a batch      (psproc() or fimproc())
+rngs    list of pairs (a,b) of ranges of surrogate data sets
+seed    master seed for the random number generators
+cpus    number of processes to use
+psp     (unnormalized) pattern spectrum to add to (default: empty
+        PatternSpectrum if numpy is available, otherwise dictionary)
+ckpt    function to call as ckpt(psp, done) with the spectrum so far
+        and the list of ranges of the surrogate data sets it covers
+        (called about every CKPT seconds, to write a checkpoint)
+stop    function to call as stop(psp, n) after each batch with the
+        spectrum so far and the number of surrogate data sets in it;
+        if it returns True, the generation is stopped (the batches
+        are then processed in order, so that the pattern spectrum
+        always covers the first surrogate data sets of the ranges)
+hist    dictionary to which to add the per-signature histograms
+        of the occurrence counters (see hstpack(), default: None)
+returns a pair (psp, done) of the (unnormalized) sum of the pattern
+        spectra and the list of ranges of the surrogate data sets
+        it covers (all given ranges unless stopped early)
+
+Surrogate data set k is always generated with the seed surrseed(seed,
+k), so that the resulting pattern spectrum does not depend on the
+number of processes or the batches (sums of counters are exact).'''
+    cnt   = sum([b-a for a,b in rngs])
+    size  = max(1, min(BATCH, cnt//(4*cpus)))
+    if stop: size = BATCH       # (fixed batches for stopping points)
+    jobs  = [(seed, k, min(size, b-k), hist is not None)
+             for a,b in rngs for k in range(a, b, size)]
+                                # split the surrogate data into batches
+    if cpus > 1:                # if to use several processes,
+        pool = Pool(cpus, init, args)       # hand out the batches
+        res  = pool.imap(proc, jobs) if stop \
+          else pool.imap_unordered(proc, jobs)
+    else:                       # if to use only the current process,
+        pool = None; init(*args)            # process the batches
+        res  = map(proc, jobs)              # one after the other
+    if psp is None:             # initialize a pattern spectrum
+        psp = PatternSpectrum() if np is not None else dict()
+    done = []; n = 0            # and the completed ranges
+    last = time()               # note the time of the last checkpoint
+    try:                        # traverse the completed batches
+        for k,c,cps,hps in res: # and aggregate the spectra into one
+            pspadd(psp, cps)    # (as soon as a batch is completed)
+            if hps: hstadd(hist, hps)   # add the histograms
+            done.append((k,k+c))# note the generated surrogates
+            n += c              # and count them
+            stderr.write('%10d\b\b\b\b\b\b\b\b\b\b' % n)
+            if ckpt and time()-last >= CKPT:
+                done = rngjoin(done)    # write a checkpoint
+                ckpt(psp, done); last = time()
+            if stop and stop(psp, n): break
+        if pool: pool.close()   # print a progress counter
+    finally:                    # and close the process pool
+        if pool: pool.terminate(); pool.join()
+    return (psp, rngjoin(done)) # return the summed pattern spectrum
+
+#-----------------------------------------------------------------------
+
+def pspgen (init, args, proc, info, cpus, part=None, ckpt=None,
+            stable=0, tmax=0, hist=None):
+    '''pspgen (init, args, proc, info, cpus, part=None, ckpt=None,
+        stable=0, tmax=0, hist=None)
+Generate (a part of) a pattern spectrum, optionally with checkpoints.
+init    function to initialize a process (psinit() or fiminit())
+args    arguments of the initialization function
+proc    function to process a batch      (psproc() or fimproc())
+info    dictionary with the total number 'cnt' of surrogate data sets,
+        the master seed 'seed' (0: use a checkpoint or the time) and
+        the generation parameters (to be stored with a checkpoint)
+cpus    number of processes to use
+part    range (a,b) of surrogate data sets to generate (default: all)
+ckpt    name of a checkpoint file (shard, see shdwrite())
+stable  number of surrogate data sets for which the decision border
+        (see psp2bdr()) must not change to stop early (0: no limit)
+tmax    time budget in seconds, after which to stop (0: no limit)
+hist    empty dictionary to store per-signature histograms in
+        (see hstpack(); counter 0 included, so that the histogram of
+        every signature sums to n; not possible with a checkpoint
+        that already covers surrogate data sets, default: None)
+returns a pair (psp, n) of the (unnormalized) sum of the pattern
+        spectra (a PatternSpectrum if numpy is available, otherwise
+        a dictionary) and the number of surrogate data sets in it
+        (less than the size of the range if stopped early)
+
+If the checkpoint file exists, it must have been created with the same
+parameters (except the number of surrogate data sets) and the data sets
+recorded in it are not generated again. Thus an interrupted run can be
+resumed and a pattern spectrum can be extended with more surrogate data
+sets. The checkpoint file is updated during the generation and finally
+covers all generated surrogate data sets. The result is the same as for
+an uninterrupted run with the same seed. (With early stopping the
+stability of the border is tracked only from the start of the run.)'''
+    a,b  = part or (0, info['cnt'])
+    psp  = dict(); done = []    # initialize the pattern spectrum
+    if ckpt and isfile(ckpt):   # if there is a checkpoint, read it
+        psp, old = shdread(ckpt)
+        if info['seed'] == 0: info['seed'] = int(old.get('seed', 0))
+        for k in set(info) | set(old):
+            if k not in ['cnt','rng'] and str(info.get(k)) != old.get(k):
+                raise ValueError('checkpoint %s differs in %s'
+                                 % (ckpt, k))
+        done = old['rng']       # get the generated surrogates
+        if done and (done[0][0] < a or done[-1][1] > b):
+            raise ValueError('checkpoint %s exceeds range %d:%d'
+                             % (ckpt, a, b))
+    if np is not None:          # sum the spectra in arrays
+        psp = PatternSpectrum(psp)
+    if info['seed'] == 0: info['seed'] = int(time())
+    if done and hist is not None:
+        raise ValueError('histograms cannot be taken from checkpoint %s'
+                         % ckpt)
+    todo = []                   # collect the missing ranges
+    for x,y in done +[(b,b)]:   # traverse the generated ranges
+        if a < x: todo.append((a,x))
+        a = y                   # note the gaps between them
+    def save (psp, rngs):       # --- write a checkpoint
+        info['rng'] = rngjoin(done +rngs)
+        shdwrite(psp, ckpt, info)
+    n    = sum([y-x for x,y in done])
+    last = [psp2bdr(psp), 0]    # border and number at last change
+    beg  = time()               # note the start time of the run
+    def stop (psp, k):          # --- check whether to stop
+        bdr = psp2bdr(psp)      # get the current border
+        if bdr != last[0]: last[:] = [bdr, k]
+        return (stable > 0 and k-last[1] >= stable) \
+            or (tmax   > 0 and time()-beg >= tmax)
+    psp, todo = psprun(init, args, proc, todo, info['seed'], cpus, psp,
+                       save if ckpt else None,
+                       stop if stable > 0 or tmax > 0 else None, hist)
+    if ckpt: save(psp, todo)    # write the final checkpoint
+    n += sum([y-x for x,y in todo])
+    if hist is not None:        # add the surrogate data sets
+        for h in hist.values(): # without a pattern of a signature
+            k = n -sum(h.values())
+            if k > 0: h[0] = k  # (counter 0 of the histograms)
+    return (psp, n)             # return the summed pattern spectrum
+
+#-----------------------------------------------------------------------
+
+def shmput (seqs, code):
+    '''shmput (seqs, code)
+Store sequences of numbers in shared memory (compressed sparse row
+format: an array of offsets followed by an array of all numbers).
+seqs    list of sequences of numbers (e.g. point/spike times or items)
+code    type code of the numbers (see module array, 'd' or 'q')
+returns a pair (shm, desc) of the shared memory block (to be closed
+        and unlinked by the caller) and a descriptor (a dictionary)
+        with which processes can attach to it (see shmget())'''
+    offs = array('q', [0])      # collect the offsets and the numbers
+    vals = array(code)          # of the sequences in arrays
+    for x in seqs: vals.extend(x); offs.append(len(vals))
+    k = len(offs)*offs.itemsize # compute the offset of the numbers
+    shm = SharedMemory(create=True, size=max(1, k +len(vals)*vals.itemsize))
+    shm.buf[:k] = memoryview(offs).cast('B')
+    shm.buf[k:k+len(vals)*vals.itemsize] = memoryview(vals).cast('B')
+    return (shm, {'name': shm.name, 'code': code,
+                  'n': len(seqs), 'm': len(vals)})
+
+#-----------------------------------------------------------------------
+
+def shmget (desc):
+    '''shmget (desc)
+Attach to sequences of numbers stored in shared memory (see shmput()).
+desc    descriptor of the shared memory block (as returned by shmput())
+returns a pair (shm, seqs) of the shared memory block (which must be
+        kept referenced) and a list of the sequences as read-only
+        memoryview slices of the shared memory (no copies)'''
+    try:                        # attach to the shared memory block
+        shm = SharedMemory(name=desc['name'], track=False)
+    except TypeError:           # (parameter track only for Python 3.13+)
+        shm = SharedMemory(name=desc['name'])
+    n, m = desc['n'], desc['m'] # get the number of sequences/numbers
+    buf  = shm.buf.toreadonly() # and the offsets and the numbers
+    offs = buf[:8*(n+1)].cast('q')
+    k    = 8*(n+1)              # compute the offset of the numbers
+    vals = buf[k:k+m*array(desc['code']).itemsize].cast(desc['code'])
+    return (shm, [vals[offs[i]:offs[i+1]] for i in range(n)])
+
+#-----------------------------------------------------------------------
+
+def psinit (trains, surr, rand, sigma, beg, end, delta,
+            target, supp, width, zmin, zmax):
+    '''psinit (trains, surr, rand, sigma, beg, end, delta,
+        target, supp, width, zmin, zmax)
+Initialize a process for multiprocessing pattern spectrum generation.
 trains  a list of pairs consisting of an item id and a list of points
-surrfn  a function to generate a surrogate data set from trains
-randfn  a function for random numbers (symmetric with mode 0)
+        or a descriptor of the points in shared memory (see shmput())
+        with the additional entry 'ids' (list of item ids);
+        the points are copied into lists, since the surrogate
+        functions and coconad expect lists, not memoryviews
+surr    surrogate data generation method (see genpsp())
+rand    random function density identifier (see genpsp())
+sigma   random dispersion parameter
 beg     beginning of points (to clamp displaced points/spikes)
 end     end       of points (to clamp displaced points/spikes)
 delta   block size for blocked point/spike permutations
@@ -54,33 +409,55 @@ supp    minimum support for CoCoNAD algorithm
 width   width of time window/maximum distance for CoCoNAD algorithm
 zmin    minimum size of an item set for CoCoNAD algorithm
 zmax    maximum size of an item set for CoCoNAD algorithm
-seed    seed for random number generator
-cnt     number of surrogate data set to generate
-queue   for returning the generated patten spectrum
-done    for communicating the number of already generated data sets
-The generated pattern spectrum is returned through the queue.'''
-    srand(seed)                 # seed random number generator
+(The functions are created in the process from their identifiers,
+since they cannot be passed to the processes of a pool.)'''
+    global PSARGS, SHM          # store the generation arguments
+    if isinstance(trains, dict().__class__):
+        SHM, pts = shmget(trains)   # attach to the shared memory
+        trains   = [(i, p.tolist()) for i,p in zip(trains['ids'], pts)]
+    PSARGS = (trains, getsurrfn(surr), lambda: getrandfn(rand)(sigma),
+              beg, end, delta, target, supp, width, zmin, zmax)
+
+#-----------------------------------------------------------------------
+
+def psproc (job):
+    '''psproc (job)
+Function for multiprocessing pattern spectrum generation.
+job     a quadruplet (seed, k, cnt, hst) of the master seed, the index
+        of the first and the number of surrogate data sets to generate
+        and whether to collect per-signature histograms
+returns a quadruplet (k, cnt, patspec, hist) of the index of the first
+        and the number of generated surrogate data sets, their (summed)
+        pattern spectrum, packed into arrays with the function psppack(),
+        and their histograms, packed with hstpack() (or None)'''
+    trains, surrfn, randfn, beg, end, delta, \
+    target, supp, width, zmin, zmax = PSARGS
+    seed, first, cnt, hst = job # get the batch parameters
     psp = dict()                # initialize the pattern spectrum
-    for k in range(cnt):        # generate surrogate data sets
+    hst = dict() if hst else None   # and the histograms
+    for k in range(first, first+cnt):
+        srand(surrseed(seed, k))# seed random number generator
         surr = surrfn(trains, randfn, beg, end, delta)
         cps  = coconad(surr, target, width, supp, zmin, zmax, '#')
         for s in cps:           # get pattern spectrum of surrogate
             if s in psp: psp[s] += cps[s]
             else:        psp[s]  = cps[s]
-        done.value += 1         # count the generated surrogate
-        if done.value % 20 == 0:# print a progress counter
-            stderr.write('%10d\b\b\b\b\b\b\b\b\b\b' % done.value)
-    queue.put(psp)              # return the pattern spectrum
+            if hst is not None: # count the surrogates per counter
+                h = hst.setdefault(s, dict()); n = int(cps[s])
+                h[n] = h.get(n, 0) +1
+    return (first, cnt, psppack(psp),   # return the pattern spectrum
+            hstpack(hst) if hst is not None else None)
 
 #-----------------------------------------------------------------------
 
 def genpsp (trains, target='s', supp=2, width=0.003, zmin=2, zmax=None,
             report='#', algo='r', mode='', cnt=1000, beg=-oo, end=oo,
             surr='p', rand='u', sigma=0.005, delta=0.03, seed=0,
-            cpus=0):
+            cpus=0, part=None, ckpt=None, stable=0, tmax=0, hist=None):
     '''genpsp (trains, target='c', supp=2, width=0.003, zmin=2, zmax=-1,
          report='#', algo='r', mode='', cnt=1000, beg=-oo, end=oo,
-         surr='p', rand='u', sigma=0.005, delta=0.03, seed=0, cpus=0)
+         surr='p', rand='u', sigma=0.005, delta=0.03, seed=0, cpus=0,
+         part=None, ckpt=None, stable=0, tmax=0, hist=None)
 Generate a pattern spectrum from surrogate data sets.
 trains  (spike) train database to mine         (mandatory)
         The database must be an iterable of (spike) trains;
@@ -124,9 +501,24 @@ sigma   random dispersion parameter            (default: 0.005)
         (standard deviation or half the base width of density)
 delta   block size for block permutations      (default: 0.03)
 seed    seed for random number generator       (default: 0)
-        (seed = 0: use system time as a seed)
+        (seed = 0: use system time or the seed of the checkpoint)
 cpus    number of cpus/threads/processes       (default: 0)
         (cpus = 0: determine number of cores automatically)
+part    range of surrogate data sets to generate (default: None)
+        (pair (a,b): generate only the data sets a to b-1 and
+        return the unnormalized pattern spectrum, see shdwrite())
+ckpt    name of a checkpoint file              (default: None)
+        (to resume an interrupted run or to extend a pattern
+        spectrum with more surrogate data sets, see pspgen())
+stable  number of surrogate data sets without a change of the
+        decision border after which to stop    (default: 0)
+tmax    time budget in seconds                 (default: 0)
+        (stable, tmax = 0: generate all cnt surrogate data sets;
+        otherwise cnt is only a maximum and the pattern spectrum
+        is normalized with the number of generated data sets)
+hist    empty dictionary to store per-signature histograms in
+        (how many surrogate data sets have k patterns with a given
+        signature, see hstpack(), for borders with hst2bdr())
 returns a pattern spectrum as a dictionary mapping pairs
         (size, support) to the corresponding occurrence counters
         or as a list of triplets (size, support, count)'''
@@ -144,34 +536,348 @@ returns a pattern spectrum as a dictionary mapping pairs
     elif rand in ['normal']:                         rand = 'n'
     if rand not in ['u','r','t','g','n']:            rand = 'u'
     if surr == 'i': cnt = 1     # adapt the number of data sets
-    if seed ==  0: seed = time()# get seed for random numbers
     if beg <= -oo: beg  = floor(min(min(t) for n,t in trains))
     if end >= +oo: end  = ceil (max(max(t) for n,t in trains))
     if cpus <= 0:               # get the number of cpus
         try:                        cpus = cpu_count()
         except NotImplementedError: cpus = 1
-    queue = Queue(); done = Value('i', 0)
-    c     = int(cnt/4)          # set up process data
-    sizes = [c for i in range(cpus-1)] +[cnt-(cpus-1)*c] \
-            if c > 0 else [cnt] # construct the argument lists
-    pargs = [trains, getsurrfn(surr), lambda: getrandfn(rand)(sigma),
-             beg, end, delta, target, supp, width, zmin, zmax]
-    pargs = [tuple(pargs +[seed+i, sizes[i], queue, done])
-             for i in range(len(sizes))]
-    procs = [Process(target=psproc, args=a) for a in pargs]
-    for p in procs: p.start()   # start all processes and then
-    for p in procs: p.join()    # wait for them to finish
-    psp = dict()                # initialize a pattern spectrum
-    for p in procs:             # traverse the completed processes
-        cps = queue.get()       # get the produced pattern spectra
-        for s in cps:           # and aggregate them into one
+    pargs = (trains, surr, rand, sigma, beg, end, delta,
+             target, supp, width, zmin, zmax)
+    info  = {'cnt': cnt, 'seed': seed}
+    if ckpt:                    # if to write checkpoints, note
+        info.update(zip(['surr', 'rand', 'sigma', 'beg', 'end', 'delta',
+                         'target', 'supp', 'width', 'zmin', 'zmax'],
+                        pargs[1:]))   # the generation parameters
+        info['data'] = pspkey(trains, {})
+    shm = None                  # store the points in shared memory
+    if cpus > 1 and SharedMemory is not None:
+        shm, desc = shmput([t for n,t in trains], 'd')
+        desc['ids'] = [n for n,t in trains]
+        pargs = (desc,) +pargs[1:]
+    try:                        # generate the pattern spectrum
+        psp,n = pspgen(psinit, pargs, psproc, info, cpus, part, ckpt,
+                       stable, tmax, hist)
+    finally:                    # release the shared memory
+        if shm: shm.close(); shm.unlink()
+    if not isinstance(psp, dict):   # convert a PatternSpectrum
+        if part is None: psp.normalize(n)
+        psp = psp.todict()      # (normalized unless only a part)
+    elif part is None:          # normalize the pattern spectrum
+        norm = 1.0/float(n)     # (unless only a part is generated)
+        for s in psp: psp[s] *= norm
+    if report != '=': return psp# return the created pattern spectrum
+    return sorted([(z,c,psp[z,c]) for z,c in psp])
+
+#-----------------------------------------------------------------------
+
+def fiminit (tracts, target, supp, zmin, zmax, surr):
+    '''fiminit (tracts, target, supp, zmin, zmax, surr)
+Initialize a process for pattern spectrum generation with fimpsp().
+tracts  transaction database (list of transactions)
+        or a descriptor of the transactions in shared memory
+        (see shmput(), for transactions of integer items)
+target  target type for the fim module (e.g. 'c' for closed item sets)
+supp    minimum support of an item set
+zmin    minimum size of an item set
+zmax    maximum size of an item set
+surr    surrogate data generation method (see fimpsp())'''
+    global FIMARGS, SHM         # store the generation arguments
+    if isinstance(tracts, dict().__class__):
+        SHM, tracts = shmget(tracts)    # attach to the shared memory
+    FIMARGS = (tracts, target, supp, zmin, zmax, surr)
+
+#-----------------------------------------------------------------------
+
+def fimproc (job):
+    '''fimproc (job)
+Function for multiprocessing pattern spectrum generation with fimpsp().
+job     a quadruplet (seed, k, cnt, hst) of the master seed, the index
+        of the first and the number of surrogate data sets to generate
+        and whether to collect per-signature histograms
+returns a quadruplet (k, cnt, patspec, hist) of the index of the first
+        and the number of generated surrogate data sets, their (summed)
+        pattern spectrum, packed into arrays with the function psppack(),
+        and their histograms, packed with hstpack() (or None)'''
+    tracts, target, supp, zmin, zmax, surr = FIMARGS
+    seed, first, cnt, hst = job # get the batch parameters
+    psp = dict()                # initialize the pattern spectrum
+    hst = dict() if hst else None   # and the histograms
+    for k in range(first, first+cnt):   # generate and mine surrogates
+        if fimgen is not None:  # if the fim module is available
+            cps = fimgen(tracts, target, supp, zmin, zmax, '#',
+                         1, surr, surrseed(seed, k), 1)
+        else:                   # if to use the pure Python fallback
+            x   = next(gensurr(tracts, surr, 1, surrseed(seed, k)))
+            cps = pyfim(x, target, supp, zmin, zmax, '#')
+        for s in cps:           # get pattern spectrum of surrogate
             if s in psp: psp[s] += cps[s]
             else:        psp[s]  = cps[s]
-    norm = 1.0/float(cnt)       # normalize the pattern spectrum
-    for s in psp: psp[s] *= norm
+            if hst is not None: # count the surrogates per counter
+                h = hst.setdefault(s, dict()); n = int(cps[s])
+                h[n] = h.get(n, 0) +1
+    return (first, cnt, psppack(psp),   # return the pattern spectrum
+            hstpack(hst) if hst is not None else None)
+
+#-----------------------------------------------------------------------
+
+def fimpsp (tracts, target='s', supp=2, zmin=2, zmax=-1, report='#',
+            cnt=1000, surr='p', seed=0, cpus=0, part=None, ckpt=None,
+            stable=0, tmax=0, hist=None):
+    '''fimpsp (tracts, target='s', supp=2, zmin=2, zmax=-1, report='#',
+        cnt=1000, surr='p', seed=0, cpus=0, part=None, ckpt=None,
+        stable=0, tmax=0, hist=None)
+Generate a pattern spectrum from surrogates of transactional data.
+tracts  transaction database to mine           (mandatory)
+        The database must be a list or a tuple of transactions;
+        each transaction must be a list or a tuple of items.
+target  type of frequent item sets to find     (default: s)
+        s    sets/all   all     frequent item sets
+        c    closed     closed  frequent item sets
+        m    maximal    maximal frequent item sets
+supp    minimum support of an item set         (default: 2)
+        (positive: percentage, negative: absolute number)
+zmin    minimum number of items per item set   (default: 2)
+zmax    maximum number of items per item set   (default: no limit)
+report  pattern spectrum reporting format      (default: #)
+        =    pattern spectrum as a list of triplets
+        #    pattern spectrum as a dictionary
+cnt     number of surrogate data sets          (default: 1000)
+surr    surrogate data generation method       (default: p)
+        i    ident      identity (keep original data)
+        r    random     random transaction generation
+        p    swap       permutation by pair swaps
+        s    shuffle    shuffle table-derived data (columns)
+seed    seed for random number generator       (default: 0)
+        (seed = 0: use system time or the seed of the checkpoint)
+cpus    number of cpus/threads/processes       (default: 0)
+        (cpus = 0: determine number of cores automatically)
+part    range of surrogate data sets to generate (default: None)
+        (pair (a,b): generate only the data sets a to b-1 and
+        return the unnormalized pattern spectrum, see shdwrite())
+ckpt    name of a checkpoint file              (default: None)
+        (to resume an interrupted run or to extend a pattern
+        spectrum with more surrogate data sets, see pspgen())
+stable  number of surrogate data sets without a change of the
+        decision border after which to stop    (default: 0)
+tmax    time budget in seconds                 (default: 0)
+        (stable, tmax = 0: generate all cnt surrogate data sets;
+        otherwise cnt is only a maximum and the pattern spectrum
+        is normalized with the number of generated data sets)
+hist    empty dictionary to store per-signature histograms in
+        (how many surrogate data sets have k patterns with a given
+        signature, see hstpack(), for borders with hst2bdr())
+returns a pattern spectrum as a dictionary mapping pairs
+        (size, support) to the corresponding occurrence counters
+        or as a list of triplets (size, support, count)
+
+Unlike the function genpsp() of the fim module, each surrogate data
+set is generated and mined separately with the seed surrseed(seed, k),
+so that the pattern spectrum for a given seed is the same regardless
+of the number of processes (and can be split into parts, which
+may be generated on different machines and merged with shdmerge(),
+provided the same non-zero seed is used for all parts).
+
+Without the fim module the surrogate data sets are generated with
+fimsurr.gensurr() (needs numpy) and mined with pyfim.fim(). Then the
+pattern spectrum is also reproducible, but differs from the one
+obtained with the fim module (other random number generators).'''
+    if fimgen is None and gensurr is None:  # check for the fim module
+        raise ImportError('fimpsp() needs the fim module or numpy')
+    if surr == 'i': cnt = 1     # adapt the number of data sets
+    if cpus <= 0:               # get the number of cpus
+        try:                        cpus = cpu_count()
+        except NotImplementedError: cpus = 1
+    pargs = (tracts, target, supp, zmin, zmax, surr)
+    info  = {'cnt': cnt, 'seed': seed}
+    if ckpt:                    # if to write checkpoints, note
+        info.update(zip(['target', 'supp', 'zmin', 'zmax', 'surr'],
+                        pargs[1:]))   # the generation parameters
+        info['data'] = pspkey(tracts, {})
+    shm = None                  # store the transactions in shared memory
+    if cpus > 1 and SharedMemory is not None \
+    and all([isinstance(i, (0).__class__) for t in tracts for i in t]):
+        shm, desc = shmput(tracts, 'q')
+        pargs = (desc,) +pargs[1:]
+    try:                        # generate the pattern spectrum
+        psp,n = pspgen(fiminit, pargs, fimproc, info, cpus, part, ckpt,
+                       stable, tmax, hist)
+    finally:                    # release the shared memory
+        if shm: shm.close(); shm.unlink()
+    if not isinstance(psp, dict):   # convert a PatternSpectrum
+        if part is None: psp.normalize(n)
+        psp = psp.todict()      # (normalized unless only a part)
+    elif part is None:          # normalize the pattern spectrum
+        norm = 1.0/float(n)     # (unless only a part is generated)
+        for s in psp: psp[s] *= norm
     if report != '=': return psp# return the created pattern spectrum
     return sorted([(z,c,psp[z,c]) for z,c in psp])
 
+
+#-----------------------------------------------------------------------
+
+def choose (n, k):
+    '''choose (n, k)
+Compute the binomial coefficient n choose k (as an integer).'''
+    if n-k < k: k = n-k         # minimize the loop executions
+    r = 1                       # calculate \prod_{i=1}^k (n-i+1)/i
+    for i in range(1, k+1): r = (r*(n-i+1)) // i
+    return r                    # return the binomial coefficient
+
+#-----------------------------------------------------------------------
+
+def samplelp (probs, smpl, rng):
+    '''samplelp (probs, smpl, rng)
+Compute the logarithms of the probabilities of item samples, that is,
+of drawing the item sets without replacement, with item probabilities
+proportional to probs, in any order.
+probs   numpy array of item probabilities
+smpl    numpy array of shape (m, k) with the items of m samples
+rng     numpy random number generator (for shuffling)
+returns a numpy array with the m log-probabilities
+
+For up to four items all k! orders are summed (exact), for more items
+the probability is extrapolated from the ascending order, 7 random
+orders and the 8 reversed orders (as in the fim module).'''
+    m, k = smpl.shape           # get the item probabilities
+    p = probs[smpl]             # of the samples
+    if k <= 4:                  # traverse all orders of few items
+        q = p[:, list(permutations(range(k)))]; w = 0.0
+    else:                       # draw some orders of many items
+        idx = np.argsort(rng.random((m, 8, k)), axis=2)
+        idx[:,0] = np.argsort(p, axis=1)
+        q = np.take_along_axis(np.broadcast_to(p[:,None], idx.shape),
+                               idx, 2)
+        q = np.concatenate([q, q[:,:,::-1]], axis=1)
+        w = lgamma(k+1) -log(q.shape[1])
+    r = 1.0 -np.cumsum(q, axis=2) +q    # remaining probability mass
+    r = np.maximum(r, q)        # (at least the next item's, rounding)
+    lp = (np.log(q) -np.log(r)).sum(axis=2)
+    mx = lp.max(axis=1)         # sum the probabilities of the orders
+    return mx +np.log(np.exp(lp -mx[:,None]).sum(axis=1)) +w
+
+#-----------------------------------------------------------------------
+
+def estpsp (tracts, target='s', supp=2, zmin=2, zmax=-1, report='#',
+            equiv=10000, alpha=0.5, smpls=1000, seed=0):
+    '''estpsp (tracts, target='s', supp=2, zmin=2, zmax=-1, report='#',
+        equiv=10000, alpha=0.5, smpls=1000, seed=0)
+Estimate a pattern spectrum from data characteristics.
+tracts  transaction database to mine           (mandatory)
+        The database must be a list or a tuple of transactions;
+        each transaction must be a list or a tuple of items.
+        If the database is a dictionary, the transactions are
+        the keys, the values their (integer) multiplicities.
+target  type of frequent item sets to find     (default: s)
+        s/a  sets/all   all     frequent item sets
+supp    minimum support of an item set         (default: 2)
+        (positive: percentage, negative: absolute number)
+zmin    minimum number of items per item set   (default: 2)
+zmax    maximum number of items per item set   (default: no limit)
+report  pattern spectrum reporting format      (default: #)
+        =    pattern spectrum as a list of triplets
+        #    pattern spectrum as a dictionary
+equiv   equivalent number of surrogates        (default: 10000)
+alpha   probability dispersion factor          (default: 0.5)
+        (alpha <= 0: equal item probabilities)
+smpls   number of samples per item set size    (default: 1000)
+seed    seed for random number generator       (default: 0)
+        (seed = 0: use system time as a seed)
+returns a pattern spectrum as a dictionary mapping pairs
+        (size, support) to the corresponding occurrence counters
+        or as a list of triplets (size, support, count)
+
+This is a vectorized version of the function estpsp() of the fim
+module (which is used by the script if it is available): the
+number of item set occurrences of each size (slots) is computed
+once, the support of smpls random item sets per size is modeled
+by a Poisson distribution whose parameter is derived from the
+(dispersed) item frequencies, and the averaged distributions are
+scaled to the total number of item sets of each size.
+
+Unlike the fim module, equal transactions are counted with their
+multiplicities (for the slots, the item probabilities, which are
+normalized to sum to 1, and the maximum support) and item sets of
+all sizes up to the number of frequent items are estimated. For data
+without equal transactions the simple estimation (alpha <= 0) thus
+agrees with the fim module for all sizes except the largest.'''
+    if np is None:              # check for the numpy module
+        raise ImportError('estpsp() needs the numpy module')
+    if target not in 'sa':      # check the function arguments
+        raise ValueError('invalid target type: ' +str(target))
+    if zmin < 1: raise ValueError('zmin must be positive')
+    if zmax < 1: zmax = oo      # check the size range
+    if zmax < zmin: raise ValueError('zmax must be >= zmin')
+    if smpls <= 0: raise ValueError('smpls must be positive')
+    if equiv <= 0: equiv = 1    # check the number of data sets
+    if seed  == 0: seed  = int(time())
+    rng  = np.random.default_rng(seed)
+    tracts = tracts.items() if isinstance(tracts, dict) \
+        else [(t,1) for t in tracts]    # get transaction multiplicities
+    tracts = [(frozenset(t), w) for t,w in tracts]
+    wgt  = sum([w for t,w in tracts])
+    frqs = dict()               # count the item frequencies
+    for t,w in tracts:
+        for i in t: frqs[i] = frqs.get(i, 0) +w
+    smin = -supp if supp < 0 else supp/100.0 *wgt *(1-float_info.epsilon)
+    smin = int(ceil(smin))      # compute absolute minimum support
+    items = [i for i in frqs if frqs[i] >= smin]
+    n = len(items)              # remove infrequent items
+    if n <= 0: return {} if report != '=' else []
+    code = set(items)           # reduce the transactions to the
+    red  = dict()               # frequent items and remove those
+    for t,w in tracts:          # with fewer than zmin items
+        t = t & code            # (equal transactions are combined
+        if len(t) < zmin: continue  # with their multiplicities)
+        red[t] = red.get(t, 0) +w
+    cnt  = sum(red.values())    # (maximum support)
+    rfrq = dict()               # count the item frequencies in the
+    for t,w in red.items():     # reduced transactions (so that the
+        for i in t: rfrq[i] = rfrq.get(i, 0) +w # probs. sum to 1)
+    if supp >= 0:               # compute minimum support for spectrum
+        smin = int(ceil(supp/100.0 *cnt *(1-float_info.epsilon)))
+    smin = max(smin, 1)         # (on the remaining transactions)
+    sizes = dict()              # count transactions per size
+    for t,w in red.items(): sizes[len(t)] = sizes.get(len(t), 0) +w
+    cnts = [0]*(n+1)            # count the slots per item set size,
+    for s,m in sizes.items():   # i.e. the item set occurrences
+        for k in range(1, s+1): cnts[k] += m*choose(s,k)
+    lgc = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1,cnt+1)))])
+    probs = np.array([rfrq.get(i, 0) for i in items], dtype=np.float64)
+    if cnt > 0: probs /= probs.sum()
+    if alpha > 0 and alpha != 1:  # contract the rate distribution
+        probs = (probs -1.0/n) *alpha +1.0/n
+    psp = dict()                # traverse the item set sizes
+    for z in range(zmin, int(min(zmax, n))+1):
+        if cnts[z] <= 0: continue   # skip sizes without slots
+        y = lgamma(n+1) -lgamma(z+1) -lgamma(n-z+1)
+        if alpha <= 0:          # simple estimation (equal probs.)
+            l = np.array([log(cnts[z]) -y])
+        else:                   # complex estimation (sampling)
+            smpl = np.argsort(rng.random((smpls, n)), axis=1)[:,:z]
+            l = log(cnts[z]) +samplelp(probs, smpl, rng)
+            l = l[np.isfinite(l)]   # (samples with items of
+            if len(l) <= 0: continue    # probability 0 are dropped)
+        t = -log(equiv) -y -9   # threshold for the distribution
+        lam = np.exp(l)         # Poisson parameters of the samples
+        L = float(lam.max())    # find the largest support to consider
+        cmax = int(min(cnt, ceil(L +sqrt(2*L*(abs(t)+1)) +abs(t) +1)))
+        c = np.arange(cmax+1)   # compute the support distribution
+        dist = np.zeros(cmax+1)
+        step = max(1, (1 << 22) // (cmax+1))
+        for k in range(0, len(l), step):
+            x = l[k:k+step,None]*c -lam[k:k+step,None] -lgc[:cmax+1]
+            x[:,1:][x[:,1:] < t] = -oo
+            dist += np.exp(x).sum(axis=0)
+        dist *= exp(y) /len(l)  # scale to the number of item sets
+        if alpha > 0:           # normalize to the number of slots
+            s = float((c *dist).sum())
+            if s > 0: dist *= cnts[z]/s
+        frq = np.floor(dist *equiv +0.5)
+        for s in np.nonzero(frq[smin:])[0] +smin:
+            psp[z,int(s)] = float(frq[s]) *(1.0/equiv)
+    if report != '=': return psp# return the estimated pattern spectrum
+    return sorted([(z,c,psp[z,c]) for z,c in psp])
+
 #-----------------------------------------------------------------------
 
 def pspthresh (patspec, thresh=1e-4):
@@ -183,6 +889,8 @@ patspec pattern spectrum (pattern signatures considered chance events);
         occurrence frequencies
 thresh  threshold for keeping/deleting entries
 returns a reduced pattern spectrum'''
+    if isinstance(patspec, PatternSpectrum):
+        return patspec.thresh(thresh)
     return dict([(s,f) for s,f in patspec.items() if f >= thresh])
 
 #-----------------------------------------------------------------------
@@ -195,13 +903,18 @@ patspec pattern spectrum (pattern signatures considered chance events);
         occurrence frequencies
 returns an array with the minimum support thresholds per size
         (maximum support +1 in pattern spectrum per size)'''
+    if isinstance(patspec, PatternSpectrum):
+        return patspec.border()
     if not isinstance(patspec, dict().__class__):
         patspec = [(z,c) for z,c,n in patspec]
     n      = max([z for z,c in patspec]+[0])
-    border = list(range(n+1)); m = -1
-    for z in reversed(border):  # determine the detection border
-        m = max([c for a,c in patspec if a == z]+[m])
-        border[z] = m+1         # (support thresholds per size)
+    border = [-1]*(n+1)         # find the maximum support per size
+    for z,c in patspec:         # (in a single pass over the spectrum)
+        if c > border[z]: border[z] = c
+    m = -1                      # determine the detection border
+    for z in range(n, -1, -1):  # (support thresholds per size)
+        if border[z] > m: m = border[z]
+        border[z] = m+1         # (maximum over all larger sizes)
     border[0:2] = [oo,oo]       # entirely rule out sizes 0 and 1
     return border               # return the created border
 
@@ -220,13 +933,394 @@ returns a filtered set of patterns'''
 
 #-----------------------------------------------------------------------
 
+def hst2psp (hist):
+    '''hst2psp (hist)
+Compute a pattern spectrum from per-signature histograms.
+hist    dictionary mapping pattern signatures (size, support) to
+        histograms of occurrence counters (see hstpack())
+returns the pattern spectrum (average occurrence counters) as a
+        dictionary mapping pattern signatures to frequencies
+        (identical to the result of genpsp()/fimpsp())'''
+    psp = dict()                # initialize the pattern spectrum
+    for s,h in hist.items():    # traverse the signatures
+        n = sum([k*f for k,f in h.items()])
+        if n > 0: psp[s] = n *(1.0/float(sum(h.values())))
+    return psp                  # return the created pattern spectrum
+
+#-----------------------------------------------------------------------
+
+def hst2bdr (hist, crit='x', alpha=0.05, ntests=0):
+    '''hst2bdr (hist, crit='x', alpha=0.05, ntests=0)
+Find a decision border from per-signature histograms.
+hist    dictionary mapping pattern signatures (size, support) to
+        histograms of occurrence counters (see hstpack())
+crit    criterion for the border                (default: x)
+        x    maximum    no surrogate data set has a pattern with the
+                        signature (same as psp2bdr())
+        q    quantile   at most a fraction alpha of the surrogate
+                        data sets has a pattern with the signature
+        p    p-value    at most a fraction alpha of the surrogate data
+                        sets has a pattern with at least the size and
+                        at least the support (union bound)
+        b    Bonferroni like p, with alpha divided by ntests
+alpha   significance level                      (default: 0.05)
+ntests  number of tests for Bonferroni correction (default: 0)
+        (0: number of signatures in the histograms)
+returns an array with the minimum support thresholds per size'''
+    if not hist: return psp2bdr(hist)
+    cnt  = sum(next(iter(hist.values())).values())
+    hits = dict([(s, cnt-h.get(0, 0)) for s,h in hist.items()])
+    if crit == 'b':             # Bonferroni correction of the level
+        alpha /= float(ntests if ntests > 0 else len(hist))
+    if crit in 'xq':            # if to ignore signatures
+        a = 0 if crit == 'x' else alpha*cnt   # with few surrogates
+        return psp2bdr([(z,c,n) for (z,c),n in hits.items() if n > a])
+    zmax = max([z for z,c in hits])
+    cmax = max([c for z,c in hits])
+    lim  = alpha*cnt            # maximum number of surrogates
+    cum  = [0]*(cmax+2)         # surrogates with larger size/support
+    border = [oo]*(zmax+1)      # initialize the border
+    for z in range(zmax, -1, -1):
+        row = [0]*(cmax+2)      # collect the hits of this size
+        for c in range(cmax+1): row[c] = hits.get((z,c), 0)
+        for c in range(cmax, -1, -1):
+            row[c] += row[c+1]  # sum over larger supports
+        for c in range(cmax+1): cum[c] += row[c]
+        c = cmax+1              # find smallest support such that
+        while c > 0 and cum[c-1] <= lim: c -= 1  # few surrogates
+        border[z] = c           # have larger/equal size and support
+    border[0:2] = [oo,oo]       # entirely rule out sizes 0 and 1
+    return border               # return the created border
+
+#-----------------------------------------------------------------------
+
+class PatternSpectrum (object):
+    '''PatternSpectrum (patspec=(), dense=None)
+Pattern spectrum stored in arrays (needs numpy).
+patspec pattern spectrum to convert, which may be
+        - a dictionary mapping (size, support) pairs to counters,
+        - an iterable of triplets (size, support, count),
+        - a triplet of arrays (sizes, supps, cnts) (see psppack()),
+        - another PatternSpectrum object
+dense   whether to store the counters in a dense 2D array
+        (indexed by size and support) or as sorted arrays of
+        (size, support, count) triplets (COO format) for sparse
+        spectra (default: choose automatically, dense if the
+        array has at most DENSE cells per pattern signature)
+Entries with a zero counter are treated as absent (as with a
+dictionary, which contains only occurring signatures).'''
+
+    def __init__ (self, patspec=(), dense=None):
+        if np is None:          # check for the numpy module
+            raise ImportError('PatternSpectrum needs numpy')
+        if   isinstance(patspec, PatternSpectrum):
+            z,c,n = patspec.coo()
+        elif isinstance(patspec, dict().__class__):
+            z = [s[0] for s in patspec]
+            c = [s[1] for s in patspec]
+            n = list(patspec.values())
+        elif isinstance(patspec, tuple) and len(patspec) == 3 \
+        and  isinstance(patspec[0], (array, np.ndarray)):
+            z,c,n = patspec     # packed spectrum (from psppack())
+        else:                   # list of triplets
+            patspec = list(patspec)
+            z = [t[0] for t in patspec]
+            c = [t[1] for t in patspec]
+            n = [t[2] for t in patspec]
+        self.set(z, c, n, dense)
+
+    def set (self, z, c, n, dense=None):
+        '''set (z, c, n, dense=None)
+Set the counters of the pattern spectrum (summing duplicates).
+z       array of sizes    of pattern signatures
+c       array of supports of pattern signatures
+n       array of occurrence counters
+dense   whether to use a dense array (default: automatic)
+returns the pattern spectrum itself'''
+        z = np.asarray(z, dtype=np.int64)
+        c = np.asarray(c, dtype=np.int64)
+        n = np.asarray(n, dtype=np.float64)
+        rows = int(z.max())+1 if len(z) else 0
+        cols = int(c.max())+1 if len(c) else 0
+        if dense is None:       # choose the representation
+            dense = rows*cols <= DENSE*len(z)
+        if dense:               # if to use a dense array,
+            self.cnts = np.zeros((rows, cols))  # sum the counters
+            np.add.at(self.cnts, (z, c), n)     # into its cells
+            self.sizes = self.supps = self.keys = None
+        else:                   # if to use sorted triplets (COO)
+            k, inv = np.unique(z*cols+c, return_inverse=True)
+            n = np.bincount(inv.ravel(), n, len(k)).astype(np.float64)
+            self.keys  = k[n != 0]  # combine duplicate signatures
+            self.cnts  = n[n != 0]  # and remove zero counters
+            self.sizes = self.keys // max(cols, 1)
+            self.supps = self.keys %  max(cols, 1)
+        self.cols = cols        # note the number of columns (supports)
+        return self             # return the pattern spectrum
+
+    def isdense (self):
+        '''isdense ()
+returns whether the counters are stored in a dense 2D array'''
+        return self.sizes is None
+
+    def coo (self):
+        '''coo ()
+returns a triplet (sizes, supps, cnts) of numpy arrays with the
+        occurring pattern signatures (sorted) and their counters'''
+        if not self.isdense():  # sparse spectrum: return the arrays
+            return (self.sizes, self.supps, self.cnts)
+        z,c = np.nonzero(self.cnts)   # dense spectrum: collect
+        return (z, c, self.cnts[z,c]) # the non-zero entries
+
+    def __len__ (self):
+        return int(np.count_nonzero(self.cnts))
+
+    def __iter__ (self):
+        z,c,n = self.coo()      # iterate over the signatures
+        return iter(zip(z.tolist(), c.tolist()))
+
+    def __contains__ (self, sig):
+        return self[sig] != 0
+
+    def __getitem__ (self, sig):
+        z,c = sig               # get the counter of a signature
+        if self.isdense():      # dense spectrum: index the array
+            if 0 <= z < self.cnts.shape[0] \
+            and 0 <= c < self.cnts.shape[1]:
+                return float(self.cnts[z,c])
+            return 0.0          # (signatures outside are absent)
+        if not 0 <= c < self.cols: return 0.0
+        k = z*self.cols +c      # binary search in the sorted keys
+        i = int(np.searchsorted(self.keys, k))
+        if i < len(self.keys) and self.keys[i] == k:
+            return float(self.cnts[i])
+        return 0.0              # (signature does not occur)
+
+    def todict (self):
+        '''todict ()
+returns the pattern spectrum as a dictionary mapping pattern
+        signatures (size, support) to occurrence counters'''
+        z,c,n = self.coo()
+        return dict(zip(zip(z.tolist(), c.tolist()), n.tolist()))
+
+    def totriplets (self):
+        '''totriplets ()
+returns the pattern spectrum as a sorted list of triplets
+        (size, support, count)'''
+        z,c,n = self.coo()
+        return list(zip(z.tolist(), c.tolist(), n.tolist()))
+
+    def pack (self):
+        '''pack ()
+returns the pattern spectrum packed into arrays (see psppack())'''
+        z,c,n = self.coo()
+        return (array('i', z.tolist()), array('i', c.tolist()),
+                array('d', n.tolist()))
+
+    def add (self, other):
+        '''add (other)
+Add (merge) another pattern spectrum to this pattern spectrum.
+other   pattern spectrum to add (in any format accepted by the
+        constructor)
+returns the pattern spectrum itself'''
+        if not isinstance(other, PatternSpectrum):
+            other = PatternSpectrum(other)
+        if self.isdense() and other.isdense():
+            r = max(self.cnts.shape[0], other.cnts.shape[0])
+            c = max(self.cnts.shape[1], other.cnts.shape[1])
+            a = np.zeros((r, c)); b = other.cnts
+            a[:self.cnts.shape[0], :self.cnts.shape[1]] = self.cnts
+            a[:b.shape[0], :b.shape[1]] += b
+            self.cnts = a       # add dense arrays directly
+            return self         # and return the spectrum
+        z1,c1,n1 = self.coo(); z2,c2,n2 = other.coo()
+        return self.set(np.concatenate((z1,z2)), np.concatenate((c1,c2)),
+                        np.concatenate((n1,n2)))
+
+    def normalize (self, cnt):
+        '''normalize (cnt)
+Normalize the pattern spectrum (divide the counters by cnt).
+cnt     number of surrogate data sets
+returns the pattern spectrum itself'''
+        self.cnts *= 1.0/float(cnt)
+        return self             # scale the counters
+
+    def thresh (self, thresh=1e-4):
+        '''thresh (thresh=1e-4)
+Threshold the pattern spectrum (see pspthresh()).
+thresh  threshold for keeping/deleting entries
+returns a new, reduced pattern spectrum'''
+        z,c,n = self.coo(); k = n >= thresh
+        return PatternSpectrum((z[k], c[k], n[k]), self.isdense())
+
+    def border (self):
+        '''border ()
+Find the decision border of the pattern spectrum (see psp2bdr()).
+returns an array with the minimum support thresholds per size
+        (maximum support +1 in pattern spectrum per size)'''
+        if not len(self):       # empty spectrum: no supports
+            m  = np.full(1, -1, dtype=np.int64)
+        elif self.isdense():    # find last non-zero cell per row
+            nz = self.cnts != 0
+            m  = self.cnts.shape[1]-1 -np.argmax(nz[:,::-1], axis=1)
+            m[~nz.any(axis=1)] = -1
+        else:                   # find maximum support per size
+            m  = np.full(int(self.sizes.max())+1, -1, dtype=np.int64)
+            np.maximum.at(m, self.sizes, self.supps)
+        m = np.maximum.accumulate(m[::-1])[::-1]
+        border = (m+1).tolist() # take maximum over all larger sizes
+        border[0:2] = [oo,oo]   # entirely rule out sizes 0 and 1
+        return border           # return the created border
+
+    def filter (self, pats):
+        '''filter (pats)
+Perform pattern spectrum filtering (see pspfilter()).
+pats    set of patterns to filter; a list of pairs (item set, support)
+returns the patterns with a support at or above the border'''
+        pats = list(pats)       # get the patterns as a list
+        bdr  = np.array(self.border(), dtype=np.float64)
+        z = np.fromiter((len(p) for p,c in pats), np.int64, len(pats))
+        c = np.fromiter((c      for p,c in pats), np.float64, len(pats))
+        k = (z >= len(bdr)) | (c >= bdr[np.minimum(z, len(bdr)-1)])
+        return [pats[i] for i in np.flatnonzero(k).tolist()]
+
+#-----------------------------------------------------------------------
+
+def info2str (info):
+    '''info2str (info)
+Format the information about a (partial) pattern spectrum.
+info    dictionary with the number cnt of surrogate data sets, the
+        list rng of ranges of surrogate data sets and generation
+        parameters (see shdwrite(); all entries are optional)
+returns the information as a string of fields "key=value"'''
+    hdr = []                    # initialize the fields
+    if 'cnt' in info: hdr.append('cnt=%d' % info['cnt'])
+    if 'rng' in info:           # format the number and the ranges
+        hdr.append('rng=' +','.join(['%d:%d' % r for r in info['rng']]))
+    return ' '.join(hdr +['%s=%s' % (k,info[k]) for k in sorted(info)
+                          if k not in ['cnt','rng']])
+
+#-----------------------------------------------------------------------
+
+def str2info (fields):
+    '''str2info (fields)
+Parse the information about a (partial) pattern spectrum.
+fields  list of fields "key=value" (see info2str())
+returns the information as a dictionary (cnt as an integer, rng as a
+        list of pairs, all other parameters as strings)'''
+    info = dict([f.split('=', 1) for f in fields])
+    if 'cnt' in info: info['cnt'] = int(info['cnt'])
+    if 'rng' in info:           # convert the number and the ranges
+        info['rng'] = [tuple([int(x) for x in r.split(':')])
+                       for r in info['rng'].split(',') if r]
+    return info                 # return the parsed information
+
+#-----------------------------------------------------------------------
+
+def pspbwrite (patspec, fname, info=None, raw=False):
+    '''pspbwrite (patspec, fname, info=None, raw=False)
+Write a pattern spectrum to a binary file.
+patspec the pattern spectrum to write as a dictionary mapping
+        (size, support) pairs (i.e. pattern signatures) to
+        occurrence frequencies (or counters, if raw is true)
+fname   name of the file to write to
+info    dictionary with information about the pattern spectrum
+        (see info2str(), e.g. the number cnt of surrogate data sets)
+raw     whether the pattern spectrum is unnormalized (a shard)
+
+File format (version 1, little endian): a header (see PSPHDR) with
+the magic bytes "PSPB", the version, the kind of the counters (0:
+frequencies, 1: raw counters (a shard), 2: raw counters to be divided
+by cnt), the length of the information text and the number m of
+entries, followed by the information text (see info2str()), the sizes
+and the supports (int32[m] each) and the counters (int64[m] for raw
+counters, float64[m] for frequencies), each aligned to 8 bytes.
+Normalized spectra are stored with raw counters if info contains cnt
+and the frequencies are reproduced exactly by dividing by cnt.'''
+    sigs = sorted(patspec)      # sort the pattern signatures
+    vals = [patspec[x] for x in sigs]
+    kind = 0; cnts = array('d', vals)
+    if raw:                     # if unnormalized counters
+        if all([v == int(v) for v in vals]):
+            kind = 1; cnts = array('q', [int(v) for v in vals])
+    elif info and int(info.get('cnt', 0)) > 0:
+        cnt  = int(info['cnt']); norm = 1.0/float(cnt)
+        vals = [int(round(v*cnt)) for v in vals]
+        if all([v*norm == patspec[x] for v,x in zip(vals, sigs)]):
+            kind = 2; cnts = array('q', vals)
+    text = info2str(info or {}).encode('utf-8')
+    z    = array('i', [x[0] for x in sigs])
+    c    = array('i', [x[1] for x in sigs])
+    if byteorder != 'little':   # store all numbers as little endian
+        for a in (z, c, cnts): a.byteswap()
+    with open(fname, 'wb') as out:
+        out.write(PSPHDR.pack(b'PSPB', PSPVER, kind, len(text), len(sigs)))
+        out.write(text)         # write the header and the information
+        out.write(b'\0' *(-(PSPHDR.size +len(text)) % 8))
+        out.write(z.tobytes()); out.write(c.tobytes())
+        out.write(b'\0' *(-8*len(sigs) % 8))
+        out.write(cnts.tobytes())   # write the signatures and counters
+
+#-----------------------------------------------------------------------
+
+def pspbread (fname):
+    '''pspbread (fname)
+Read a pattern spectrum from a binary file (see pspbwrite()).
+The file is memory mapped and the arrays are returned as views on the
+mapped file (numpy arrays if numpy is available, memory views
+otherwise), that is, without copying or parsing. The file is unmapped
+when the last view is deleted.
+fname   name of the file to read from
+returns a triplet (part, norm, info) of the packed pattern spectrum
+        (sizes, supps, cnts) (see psppack(); the counters are raw
+        counters if the file contains a shard), the factor with which
+        the counters have to be multiplied to obtain the occurrence
+        frequencies (see pspunpack()) and the information about the
+        pattern spectrum (see str2info())'''
+    with open(fname, 'rb') as inp:  # memory map the file
+        mm = mmap(inp.fileno(), 0, access=ACCESS_READ)
+    try:                        # read the file header
+        magic, ver, kind, k, m = PSPHDR.unpack_from(mm, 0)
+        if magic != b'PSPB':    # check the magic bytes and version
+            raise ValueError('%s is not a binary pattern spectrum file'
+                             % fname)
+        if ver > PSPVER:
+            raise ValueError('%s has unsupported version %d'
+                             % (fname, ver))
+        x = PSPHDR.size         # get the information text
+        info = str2info(mm[x:x+k].decode('utf-8').split())
+    except BaseException:       # unmap the file on errors
+        mm.close(); raise
+    x = (x+k+7) & ~7            # get the offsets of the sizes,
+    y = x +4*m                  # the supports and the counters
+    w = (y +4*m +7) & ~7
+    if np is not None:          # if numpy is available, create arrays
+        z = np.frombuffer(mm, '<i4', m, x)
+        c = np.frombuffer(mm, '<i4', m, y)
+        n = np.frombuffer(mm, '<i8' if kind else '<f8', m, w)
+    else:                       # if to use memory views
+        mv = memoryview(mm)
+        z = mv[x:y].cast('i'); c = mv[y:y+4*m].cast('i')
+        n = mv[w:w+8*m].cast('q' if kind else 'd')
+        if byteorder != 'little':   # convert from little endian
+            z, c, n = [array(a.format, a) for a in (z, c, n)]
+            for a in (z, c, n): a.byteswap()
+    norm = 1.0/float(info['cnt']) if kind == 2 else 1.0
+    return ((z, c, n), norm, info)
+
+#-----------------------------------------------------------------------
+
 def pspread (fname):
     '''pspread (fname)
 Read a pattern spectrum from a file.
 fname   name of the file to read from
+        (binary file, see pspbread(), if it ends in PSPBIN)
 returns the read pattern spectrum as a dictionary mapping
         (size, support) pairs (i.e. pattern signatures) to
         occurrence frequencies'''
+    if fname.endswith(PSPBIN):  # if binary file, unpack the arrays
+        part, norm, info = pspbread(fname)
+        return pspunpack(part, norm)
     patspec = dict()            # initialize a pattern spectrum
     with open(fname, 'r') as inp:
         for line in inp:        # read pattern spectrum from file
@@ -236,22 +1330,218 @@ returns the read pattern spectrum as a dictionary mapping
 
 #-----------------------------------------------------------------------
 
-def pspwrite (patspec, fname, sep=' '):
-    '''pspwrite (patspec, fname, sep=' ')
+def pspwrite (patspec, fname, sep=' ', info=None):
+    '''pspwrite (patspec, fname, sep=' ', info=None)
 Write a pattern spectrum to a file.
 patspec the pattern spectrum to write as a dictionary mapping
         (size, support) pairs (i.e. pattern signatures) to
         occurrence frequencies
 fname   name of the file to write to
-sep     column separator (default: space)'''
+        (binary file, see pspbwrite(), if it ends in PSPBIN)
+sep     column separator (default: space)
+info    information about the pattern spectrum (default: None)
+        (only stored in binary files, see pspbwrite())'''
+    if fname.endswith(PSPBIN):  # if binary file, write it directly
+        pspbwrite(patspec, fname, info); return
     with open(fname, 'w') as out:
         for s in sorted([(z,c,patspec[z,c]) for z,c in patspec]):
             out.write(('%d'+sep+'%d'+sep+'%.16g\n') % s)
 
 #-----------------------------------------------------------------------
 
+def hstwrite (hist, fname, sep=' '):
+    '''hstwrite (hist, fname, sep=' ')
+Write per-signature histograms to a file.
+hist    dictionary mapping pattern signatures (size, support) to
+        histograms of occurrence counters (see hstpack())
+fname   name of the file to write to
+sep     column separator (default: space)
+The file contains one line "size support counter surrogates" per
+histogram entry (counter 0 included).'''
+    with open(fname, 'w') as out:
+        for e in zip(*hstpack(hist)):
+            out.write(sep.join(['%d']*4) % e +'\n')
+
+#-----------------------------------------------------------------------
+
+def hstread (fname):
+    '''hstread (fname)
+Read per-signature histograms from a file (see hstwrite()).
+fname   name of the file to read from
+returns a dictionary mapping pattern signatures (size, support)
+        to histograms of occurrence counters'''
+    hist = dict()               # initialize the histograms
+    with open(fname, 'r') as inp:
+        for line in inp:        # read the histogram entries
+            z,c,k,f = [int(x) for x in line.split()]
+            hist.setdefault((z,c), dict())[k] = f
+    return hist                 # return the read histograms
+
+#-----------------------------------------------------------------------
+
+def shdwrite (patspec, fname, info, sep=' '):
+    '''shdwrite (patspec, fname, info, sep=' ')
+Write a shard, that is, the unnormalized pattern spectrum of a range
+of surrogate data sets (as returned by genpsp() or fimpsp() with the
+parameter part), to a file.
+patspec the unnormalized pattern spectrum to write as a dictionary
+        mapping (size, support) pairs (i.e. pattern signatures) to
+        summed occurrence counters
+fname   name of the file to write to
+        (binary file, see pspbwrite(), if it ends in PSPBIN)
+info    dictionary with the shard information, which must contain
+        cnt     total number of surrogate data sets (all shards)
+        rng     list of pairs (a,b) of ranges of surrogate data sets
+        and may contain additional generation parameters (like seed,
+        supp etc.), which must agree for shards to be merged
+sep     column separator (default: space)'''
+    if not isinstance(patspec, dict):   # convert a PatternSpectrum
+        patspec = patspec.todict()      # (e.g. from pspgen())
+    fd, tmp = mkstemp(suffix='.tmp', dir=dirname(abspath(fname)))
+    try:                        # write to a temporary file
+        if fname.endswith(PSPBIN):  # if to write a binary file
+            close(fd); pspbwrite(patspec, tmp, info, True)
+        else:                       # if to write a text file
+            with fdopen(fd, 'w') as out:
+                out.write('#shard ' +info2str(info) +'\n')
+                for s in sorted([(z,c,patspec[z,c]) for z,c in patspec]):
+                    out.write(('%d'+sep+'%d'+sep+'%.16g\n') % s)
+        replace(tmp, fname)     # replace the file atomically, so that
+    except BaseException:       # an interrupted run never leaves a
+        remove(tmp); raise      # partially written shard/checkpoint
+
+#-----------------------------------------------------------------------
+
+def shdread (fname):
+    '''shdread (fname)
+Read a shard (unnormalized partial pattern spectrum) from a file.
+fname   name of the file to read from
+        (binary file, see pspbread(), if it ends in PSPBIN)
+returns a pair (patspec, info) of the unnormalized pattern spectrum
+        and the shard information (see shdwrite(); the additional
+        generation parameters are returned as strings)'''
+    if fname.endswith(PSPBIN):  # if binary file, read it directly
+        part, norm, info = pspbread(fname)
+        if 'rng' not in info:   # (shards must have ranges)
+            raise ValueError('%s is not a shard file' % fname)
+        return (pspunpack(part, norm), info)
+    patspec = dict()            # initialize a pattern spectrum
+    with open(fname, 'r') as inp:
+        hdr = inp.readline().split()
+        if not hdr or hdr[0] != '#shard':
+            raise ValueError('%s is not a shard file' % fname)
+        info = str2info(hdr[1:])
+        for line in inp:        # read pattern spectrum from file
+            z,c,n = line.split()
+            patspec[int(z),int(c)] = float(n)
+    return (patspec, info)      # return the read shard
+
+#-----------------------------------------------------------------------
+
+def shdmerge (shards):
+    '''shdmerge (shards)
+Merge shards (unnormalized partial pattern spectra).
+shards  iterable of pairs (patspec, info) as returned by shdread()
+returns a pair (patspec, info) of the summed pattern spectrum and the
+        combined shard information; if the ranges of the shards cover
+        all surrogate data sets, that is, if info['rng'] == [(0,cnt)],
+        the pattern spectrum is normalized (divided by cnt) and thus
+        identical to the result of a single run of genpsp()/fimpsp()'''
+    psp = dict(); info = None   # initialize the pattern spectrum
+    for s,i in shards:          # traverse the shards
+        if info is None: info = dict(i); info['rng'] = []
+        for k in set(info) | set(i):
+            if k != 'rng' and info.get(k) != i.get(k):
+                raise ValueError('shards differ in %s' % k)
+        info['rng'] += i['rng'] # collect the surrogate ranges
+        for z,c in s:           # sum the occurrence counters
+            psp[z,c] = psp.get((z,c), 0) +s[z,c]
+    if info is None: raise ValueError('no shards to merge')
+    info['rng'] = rng = rngjoin(info['rng'])
+    if rng == [(0, info['cnt'])]:
+        norm = 1.0/float(info['cnt'])
+        for s in psp: psp[s] *= norm
+    return (psp, info)          # return the merged pattern spectrum
+
+#-----------------------------------------------------------------------
+
+def pspkey (tracts, params):
+    '''pspkey (tracts, params)
+Compute the key of a pattern spectrum for the pattern spectrum cache.
+tracts  transaction database the spectrum was generated from
+        (list or tuple of transactions, each a list or tuple of items)
+params  dictionary of the parameters the pattern spectrum depends on
+        (like target, supp, zmin, zmax, surr, cnt and seed)
+returns a hash (as a string of hexadecimal digits) of the
+        transactions (in their order) and the parameters'''
+    h = sha256()                # hash the transactions
+    for t in tracts: h.update((repr(tuple(t)) +'\n').encode())
+    h.update(repr(sorted([(k,str(v)) for k,v in params.items()]))
+             .encode())         # hash the parameters
+    return h.hexdigest()        # return the hash as a string
+
+#-----------------------------------------------------------------------
+
+def cacheget (cdir, key):
+    '''cacheget (cdir, key)
+Get a pattern spectrum from the pattern spectrum cache.
+cdir    directory of the pattern spectrum cache
+key     key of the pattern spectrum (as computed with pspkey())
+returns the cached pattern spectrum (see pspread())
+        or None if there is no pattern spectrum with this key'''
+    fname = join(cdir, key +PSPBIN)
+    if not isfile(fname): return None
+    try:                        # read the pattern spectrum
+        psp = pspread(fname); utime(fname, None)
+    except (OSError, ValueError): return None
+    return psp                  # mark it as recently used
+
+#-----------------------------------------------------------------------
+
+def cacheput (cdir, key, patspec, maxsize=256*1024*1024):
+    '''cacheput (cdir, key, patspec, maxsize=256*1024*1024)
+Store a pattern spectrum in the pattern spectrum cache.
+cdir    directory of the pattern spectrum cache (created if needed)
+key     key of the pattern spectrum (as computed with pspkey())
+patspec pattern spectrum to store (see pspwrite())
+maxsize maximum size of the cache in bytes
+        (the least recently used pattern spectra are deleted)
+
+The pattern spectrum is written to a temporary file, which is then
+renamed, so that concurrent runs never see a partially written file.'''
+    makedirs(cdir, exist_ok=True)
+    fd, tmp = mkstemp(suffix='.tmp', dir=cdir)
+    try:                        # write to a temporary file
+        close(fd); pspbwrite(patspec, tmp)
+        replace(tmp, join(cdir, key +PSPBIN))
+    except BaseException:       # atomically replace the cache entry
+        remove(tmp); raise      # (or remove the temporary file)
+    files = []                  # collect the cached pattern spectra
+    for fn in listdir(cdir):    # traverse the cache directory
+        if not fn.endswith(PSPBIN): continue
+        fn = join(cdir, fn)
+        try:    files.append((getmtime(fn), getsize(fn), fn))
+        except OSError: pass    # (files may be deleted concurrently)
+    files.sort(reverse=True)    # sort by last use (newest first)
+    size = 0                    # sum the file sizes
+    for t,n,fn in files:        # traverse the cached spectra
+        size += n               # and delete old spectra
+        if size > maxsize and not fn.endswith(key +PSPBIN):
+            try:    remove(fn)
+            except OSError: pass
+
+#-----------------------------------------------------------------------
+
 if __name__ == '__main__':
-    psp = pspread(argv[1])
+    if len(argv) > 3 and argv[1] == '-m':
+        psp, info = shdmerge([shdread(fn) for fn in argv[3:]])
+        if info['rng'] != [(0, info['cnt'])]:
+            shdwrite(psp, argv[2], info)  # incomplete: write a shard
+            print('ranges %s of %d surrogate data sets'
+                  % (info['rng'], info['cnt'])); exit()
+        pspwrite(psp, argv[2], info=info)   # write merged spectrum
+    else:                       # if to read a pattern spectrum
+        psp = pspread(argv[1])
     bdr = psp2bdr(psp)
     bdr = [(i,bdr[i]) for i in range(len(bdr))]
     print(bdr)
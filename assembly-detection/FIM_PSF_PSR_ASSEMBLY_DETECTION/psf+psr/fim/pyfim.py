@@ -9,10 +9,26 @@
 #           2013.01.25 recursion/output data combined in a list
 #           2013.02.09 made compatible with Python 3 (print, range)
 #           2017.06.02 bugs in perfect extension processing fixed
+#           2026.10.18 bit vector tidsets added (algo='b')
+#           2026.10.18 diffsets for dense databases added (algo='d')
+#           2026.10.18 pattern spectrum reporting added (report='#')
+#           2026.10.18 support border for filtering and pruning added
+#           2026.10.18 parallel mining of search tree branches added
+#           2026.10.18 closed/maximal checks with eliminated item index
+#           2026.10.18 non-recursive generator version iter_fim() added
 #-----------------------------------------------------------------------
-from sys  import argv, stderr, maxsize
-from math import ceil
-from time import time
+from sys             import argv, stderr, maxsize
+from math            import ceil
+from itertools       import combinations
+from time            import time
+from multiprocessing import Pool, cpu_count
+
+#-----------------------------------------------------------------------
+
+try:                            # count the set bits of an integer
+    popcnt = int.bit_count      # (Python 3.10 and later)
+except AttributeError:          # (older versions of Python)
+    popcnt = lambda x: bin(x).count('1')
 
 #-----------------------------------------------------------------------
 
@@ -22,47 +38,179 @@ iset    base item set to report (list of items)
 pexs    perfect extensions of the base item set (list of items)
 supp    (absolute) support of the item set to report
 data    static recursion/output data as a list
-        [ target, supp, zmin, zmax, maxx, count [, out] ]'''
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+        (if out is a dictionary, only the pattern spectrum is built)'''
     if not pexs:                # if no perfect extensions (left)
         data[5] += 1            # count the reported item set
-        if len(data) < 7: return# check for a destination
+        out = data[6]           # check for a destination
+        if out is None: return
         n = len(iset)           # check the item set size
         if (n < data[2]) or (n > data[3]): return
-        if isinstance(data[6], [].__class__):
-            data[6].append((tuple(iset), supp))
+        if data[8] and n < len(data[8]) and supp < data[8][n]:
+            return              # check the support border
+        if isinstance(out, [].__class__):
+            out.append((tuple(iset), supp))
+        elif isinstance(out, dict().__class__):
+            out[n,supp] = out.get((n,supp), 0) +1
         else:                   # report the current item set
-            for i in iset: data[6].write(str(i)+' '), 
-            data[6].write('('+str(supp)+')\n')
+            for i in iset: out.write(str(i)+' '),
+            out.write('('+str(supp)+')\n')
+    elif isinstance(data[6], dict().__class__):
+        n = len(iset)           # count the subsets of the perfect
+        k = len(pexs); c = 1    # extensions (only for a spectrum)
+        data[5] += 1 << k       # count all reported item sets
+        for z in range(n, n+k+1):   # traverse the item set sizes
+            if z >= data[2] and z <= data[3] \
+            and (z >= len(data[8]) or supp >= data[8][z]):
+                data[6][z,supp] = data[6].get((z,supp), 0) +c
+            c = (c*(n+k-z))//(z-n+1)
     else:                       # if perfect extensions to process
         report(iset+[pexs[0]], pexs[1:], supp, data)
         report(iset,           pexs[1:], supp, data)
 
 #-----------------------------------------------------------------------
 
-def closed (tracts, elim):
+def closed (tracts, elim, tids):
     '''Check for a closed item set.
-tracts  list of transactions containing the item set
-elim    list of lists of transactions for eliminated items
-returns whether the item set is closed'''
-    for t in reversed(elim):    # try to find a perfect extension
-        if tracts <= t: return False
+tracts  set of transactions containing the item set
+elim    set of eliminated items
+tids    dictionary mapping the items to their transaction sets
+returns whether the item set is closed
+
+A perfect extension must be contained in every transaction that
+contains the item set. Hence only the eliminated items that occur
+in one of these transactions have to be checked.'''
+    if not elim: return True    # check for eliminated items
+    for x,w in tracts: break    # get a transaction with the item set
+    for i in elim.intersection(x):
+        if tracts <= tids[i]: return False
     return True                 # return whether the item set is closed
 
 #-----------------------------------------------------------------------
 
-def maximal (tracts, elim, supp):
+def maximal (tracts, elim, supp, tids, wgt):
     '''Check for a maximal item set.
-tracts  list of transactions containing the item set
-elim    list of lists of transactions for eliminated items
+tracts  set of transactions containing the item set
+elim    set of eliminated items
 supp    minimum support of an item set
+tids    dictionary mapping the items to their transaction sets
+wgt     support of the item set (total weight of the transactions)
+returns whether the item set is maximal
+
+A frequent extension must occur in at least one transaction of any
+subset of the transactions with a weight that exceeds the support of
+the item set minus the minimum support. Hence only the eliminated
+items that occur in one such subset of transactions are checked
+(unless this subset is larger than the set of eliminated items).'''
+    if not elim: return True    # check for eliminated items
+    r = wgt -supp               # get the weight that may be lost
+    cand = elim if r >= len(elim) else set()
+    for x,w in tracts:          # collect candidate extensions
+        if cand is elim: break  # from enough transactions
+        cand.update(elim.intersection(x))
+        r -= w                  # until the remaining transactions
+        if r < 0: break         # cannot reach the minimum support
+    for i in cand:              # try to find a frequent extension
+        if sum([w for x,w in tracts & tids[i]]) >= supp: return False
+    return True                 # return whether the item set is maximal
+
+#-----------------------------------------------------------------------
+
+def bitsupp (tracts, wgts):
+    '''Compute the support of a bit vector of transactions.
+tracts  bit vector of transactions containing the item set
+wgts    list of pairs (weight, bit mask) of the transaction weights
+        or None if every bit has weight 1
+returns the (absolute) support of the item set'''
+    if not wgts: return popcnt(tracts)
+    return sum([w*popcnt(tracts & m) for w,m in wgts])
+
+#-----------------------------------------------------------------------
+
+def bitclosed (tracts, elim, tids, bits):
+    '''Check for a closed item set (bit vector version).
+tracts  bit vector of transactions containing the item set
+elim    set of eliminated items
+tids    dictionary mapping the items to their bit vectors
+bits    list of pairs (transaction, weight) per bit
+returns whether the item set is closed'''
+    if not elim: return True    # check for eliminated items
+    x = bits[(tracts & -tracts).bit_length()-1][0]
+    for i in elim.intersection(x):  # check items of one transaction
+        if tracts & tids[i] == tracts: return False
+    return True                 # return whether the item set is closed
+
+#-----------------------------------------------------------------------
+
+def bitmaximal (tracts, elim, supp, wgts, tids, bits, wgt):
+    '''Check for a maximal item set (bit vector version).
+tracts  bit vector of transactions containing the item set
+elim    set of eliminated items
+supp    minimum support of an item set
+wgts    list of pairs (weight, bit mask) of the transaction weights
+tids    dictionary mapping the items to their bit vectors
+bits    list of pairs (transaction, weight) per bit
+wgt     support of the item set (total weight of the transactions)
 returns whether the item set is maximal'''
-    for t in reversed(elim):    # try to find a frequent extension
-        if sum([w for x,w in tracts & t]) >= supp: return False
+    if not elim: return True    # check for eliminated items
+    r = wgt -supp               # get the weight that may be lost
+    cand = elim if r >= len(elim) else set()
+    t = tracts if cand is not elim else 0
+    while t:                    # collect candidate extensions
+        b = t & -t; t ^= b      # from enough transactions
+        x,w = bits[b.bit_length()-1]    # (see function maximal())
+        cand.update(elim.intersection(x))
+        r -= w                  # until the remaining transactions
+        if r < 0: break         # cannot reach the minimum support
+    for i in cand:              # try to find a frequent extension
+        if bitsupp(tracts & tids[i], wgts) >= supp: return False
     return True                 # return whether the item set is maximal
 
 #-----------------------------------------------------------------------
 
-def recurse (tadb, iset, pexs, elim, data):
+def prune (proj, n, k, data):
+    '''Prune a projection with the support border.
+proj    projection of a (conditional) transaction database
+        as a list of triples (support, item, transaction set);
+        items are removed in place if no item set containing
+        them can reach the border, all of them if no item set
+        in the branch can (for target 'm' only the latter)
+n       size of the item set of the projection (prefix size)
+k       number of its perfect extensions
+data    static recursion/output data as a list
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+returns the maximum support of an item in the projection'''
+    m    = max([x[0] for x in proj])
+    zmin = max(n+1, data[2])    # get the range of item set sizes
+    zmax = min(n+k+len(proj), data[3])  # that can be reported
+    if zmax >= len(data[8]):    # if the border does not restrict
+        return m                # the largest item sets, abort
+    b = min(data[8][zmin:zmax+1]) if zmin <= zmax else m+1
+    if   m < b:                 # if no item set can reach the border,
+        del proj[:]             # remove the whole projection
+    elif data[0] != 'm':        # if not to check maximality,
+        proj[:] = [x for x in proj if x[0] >= b]  # remove items
+    return m                    # return the maximum item support
+
+#-----------------------------------------------------------------------
+
+def selpart (sel, n):
+    '''Get the part of a level of the search tree to process.
+sel     ranges (a,b) of the items/branches to process per level
+        (for parallel mining) or None (all items)
+n       number of items on the level
+returns a quadruple (a, b, xsel, skip) of the range of the items to
+        process, the ranges for the next level (or None) and whether
+        the item sets of this level are reported by another part'''
+    if not sel: return (0, n, None, False)
+    a,b = sel[0]                # get the range on this level
+    return (a, min(b, n), sel[1:] or None, len(sel) > 1 and sel[1][0] > 0)
+
+#-----------------------------------------------------------------------
+
+def recurse (tadb, iset, pexs, elim, data, sel=None):
     '''Recursive part of the eclat algorithm.
 tadb    (conditional) transaction database, in vertical representation,
         as a list of item/transaction information, one per (last) item
@@ -71,13 +219,19 @@ iset    item set (prefix of conditional transaction database)
 pexs    set of perfect extensions (parent equivalent items)
 elim    set of eliminated items (for closed/maximal check)
 data    static recursion/output data as a list
-        [ target, supp, zmin, zmax, maxx, count [, out] ]'''
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+sel     ranges (a,b) of the items/branches to process per level
+        (for parallel mining; default: None, that is, all items)'''
     tadb.sort()                 # sort items by (conditional) support
-    xelm = []; m = 0            # init. elim. items and max. support
-    for k in range(len(tadb)):  # traverse the items/item sets
+    m    = tadb[-1][0] if tadb else 0   # get maximum support
+    cm   = data[0] in 'cm'      # whether to check closed/maximal
+    a,b,xsel,skip = selpart(sel, len(tadb))
+    xelm = [i for s,i,t in tadb[:a]] if cm else []
+    if xelm: elim.update(xelm)  # note preceding items as eliminated
+    for k in range(a, b):       # traverse the items
         s,i,t = tadb[k]         # unpack the item information
-        if s > m: m = s         # find maximum extension support
-        if data[0] in 'cm' and not closed(t, elim+xelm):
+        if cm and not closed(t, elim, data[9]):
             continue            # check for a perfect extension
         proj = []; xpxs = []    # construct the projection of the
         for r,j,u in tadb[k+1:]:# trans. database to the current item:
@@ -87,22 +241,345 @@ data    static recursion/output data as a list
             elif r >= data[1]: proj.append([r,j,u])
         xpxs = pexs +xpxs       # combine perfect extensions and
         xset = iset +[i]        # add the current item to the set and
-        n    = len(xpxs) if data[0] in 'cm' else 0
-        r    = recurse(proj, xset, xpxs, elim+xelm, data) \
-               if proj and (len(xset)+n < data[4]) else 0
-        xelm += [t]             # collect the eliminated items
-        if   data[0] == 'm':    # if to report only maximal item sets
-            if r < data[1] and maximal(t, elim+xelm[:-1], data[1]):
+        n    = len(xpxs) if cm else 0
+        if not proj or len(xset)+n >= data[4]:
+            r = 0               # check whether to recurse
+        else:                   # prune with the support border
+            if data[8]: r = prune(proj, len(xset), len(xpxs), data)
+            if   not proj: pass # if the branch was pruned, skip it
+            elif data[7] == 'd' and dense(proj, t):
+                proj = [[r,j,t-u] for r,j,u in proj]
+                r = recdiff(proj, xset, xpxs, elim, data, t, xsel)
+            else:               # switch to diffsets for dense data
+                r = recurse(proj, xset, xpxs, elim, data, xsel)
+        if skip: pass           # item set is reported by other part
+        elif data[0] == 'm':    # if to report only maximal item sets
+            if r < data[1] and maximal(t, elim, data[1], data[9], s):
                 report(xset+xpxs, [], s, data)
         elif data[0] == 'c':    # if to report only closed  item sets
             if r < s: report(xset+xpxs, [], s, data)
         else:                   # if to report all frequent item sets
             report(xset, xpxs, s, data)
+        if cm:                  # collect the eliminated items
+            elim.add(i); xelm.append(i)
+    if xelm: elim.difference_update(xelm)
     return m                    # return the maximum extension support
 
 #-----------------------------------------------------------------------
 
-def eclat (tracts, target='s', supp=2, zmin=1, zmax=maxsize, out=0):
+def dense (tadb, tracts):
+    '''Check whether a conditional database is dense, that is, whether
+diffsets are smaller than transaction sets (average item coverage of
+more than half of the transactions containing the prefix).
+tadb    conditional transaction database as a list of triples
+        (support, item, transaction set)
+tracts  set of transactions containing the prefix
+returns whether diffsets should be used'''
+    return 2*sum([len(t) for s,i,t in tadb]) > len(tadb)*len(tracts)
+
+#-----------------------------------------------------------------------
+
+def recdiff (tadb, iset, pexs, elim, data, tracts, sel=None):
+    '''Recursive part of the eclat algorithm (diffset version).
+tadb    (conditional) transaction database, in vertical representation,
+        as a list of item/transaction information, one per (last) item
+        (triples of support, item and diffset, that is, the set of
+        transactions containing the prefix, but not the item)
+iset    item set (prefix of conditional transaction database)
+pexs    set of perfect extensions (parent equivalent items)
+elim    set of eliminated items (for closed/maximal check)
+data    static recursion/output data as a list
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+tracts  set of transactions containing the prefix
+        (only needed for the closed/maximal check; the transactions
+        of an item set are built from it only if they are needed)
+sel     ranges (a,b) of the items/branches to process per level
+        (for parallel mining; default: None, that is, all items)'''
+    tadb.sort()                 # sort items by (conditional) support
+    m    = tadb[-1][0] if tadb else 0   # get maximum support
+    cm   = data[0] in 'cm'      # whether to check closed/maximal
+    a,b,xsel,skip = selpart(sel, len(tadb))
+    xelm = [i for s,i,d in tadb[:a]] if cm else []
+    if xelm: elim.update(xelm)  # note preceding items as eliminated
+    for k in range(a, b):       # traverse the items
+        s,i,d = tadb[k]         # unpack the item information
+        t = None                # (transactions built only if needed)
+        if cm and elim:         # if to check for a perfect extension
+            for x in tracts:    # get a transaction with the item set
+                if x not in d: break    # (not lost for the item)
+            if not elim.isdisjoint(x[0]):
+                t = tracts -d   # get the transactions of the item set
+                if not closed(t, elim, data[9]): continue
+        proj = []; xpxs = []    # construct the projection of the
+        for r,j,e in tadb[k+1:]:# trans. database to the current item:
+            e = e - d           # lost trans. relative to current item
+            r = s -sum([w for x,w in e])
+            if   r >= s:       xpxs.append(j)
+            elif r >= data[1]: proj.append([r,j,e])
+        xpxs = pexs +xpxs       # combine perfect extensions and
+        xset = iset +[i]        # add the current item to the set and
+        n    = len(xpxs) if cm else 0
+        if not proj or len(xset)+n >= data[4]:
+            r = 0               # check whether to recurse
+        else:                   # prune with the support border
+            if data[8]: r = prune(proj, len(xset), len(xpxs), data)
+            if proj:            # if the branch was not pruned
+                if cm and t is None: t = tracts -d
+                r = recdiff(proj, xset, xpxs, elim, data, t, xsel)
+        if skip: pass           # item set is reported by other part
+        elif data[0] == 'm':    # if to report only maximal item sets
+            if r < data[1] and maximal(t if t is not None else tracts -d,
+                                       elim, data[1], data[9], s):
+                report(xset+xpxs, [], s, data)
+        elif data[0] == 'c':    # if to report only closed  item sets
+            if r < s: report(xset+xpxs, [], s, data)
+        else:                   # if to report all frequent item sets
+            report(xset, xpxs, s, data)
+        if cm:                  # collect the eliminated items
+            elim.add(i); xelm.append(i)
+    if xelm: elim.difference_update(xelm)
+    return m                    # return the maximum extension support
+
+#-----------------------------------------------------------------------
+
+def recbits (tadb, iset, pexs, elim, data, wgts, sel=None):
+    '''Recursive part of the eclat algorithm (bit vector version).
+tadb    (conditional) transaction database, in vertical representation,
+        as a list of item/transaction information, one per (last) item
+        (triples of support, item and bit vector of transactions)
+iset    item set (prefix of conditional transaction database)
+pexs    set of perfect extensions (parent equivalent items)
+elim    set of eliminated items (for closed/maximal check)
+data    static recursion/output data as a list
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+wgts    list of pairs (weight, bit mask) of the transaction weights
+        or None if every bit has weight 1
+sel     ranges (a,b) of the items/branches to process per level
+        (for parallel mining; default: None, that is, all items)'''
+    tadb.sort()                 # sort items by (conditional) support
+    m    = tadb[-1][0] if tadb else 0   # get maximum support
+    cm   = data[0] in 'cm'      # whether to check closed/maximal
+    a,b,xsel,skip = selpart(sel, len(tadb))
+    xelm = [i for s,i,t in tadb[:a]] if cm else []
+    if xelm: elim.update(xelm)  # note preceding items as eliminated
+    for k in range(a, b):       # traverse the items
+        s,i,t = tadb[k]         # unpack the item information
+        if cm and not bitclosed(t, elim, data[9], data[10]):
+            continue            # check for a perfect extension
+        proj = []; xpxs = []    # construct the projection of the
+        for r,j,u in tadb[k+1:]:# trans. database to the current item:
+            u = u & t           # intersect with subsequent vectors
+            r = bitsupp(u, wgts)
+            if   r >= s:       xpxs.append(j)
+            elif r >= data[1]: proj.append([r,j,u])
+        xpxs = pexs +xpxs       # combine perfect extensions and
+        xset = iset +[i]        # add the current item to the set and
+        n    = len(xpxs) if cm else 0
+        if not proj or len(xset)+n >= data[4]:
+            r = 0               # check whether to recurse
+        else:                   # prune with the support border
+            if data[8]: r = prune(proj, len(xset), len(xpxs), data)
+            if proj: r = recbits(proj, xset, xpxs, elim, data, wgts,
+                                 xsel)
+        if skip: pass           # item set is reported by other part
+        elif data[0] == 'm':    # if to report only maximal item sets
+            if r < data[1] and bitmaximal(t, elim, data[1], wgts,
+                                          data[9], data[10], s):
+                report(xset+xpxs, [], s, data)
+        elif data[0] == 'c':    # if to report only closed  item sets
+            if r < s: report(xset+xpxs, [], s, data)
+        else:                   # if to report all frequent item sets
+            report(xset, xpxs, s, data)
+        if cm:                  # collect the eliminated items
+            elim.add(i); xelm.append(i)
+    if xelm: elim.difference_update(xelm)
+    return m                    # return the maximum extension support
+
+#-----------------------------------------------------------------------
+
+def bittadb (tracts):
+    '''Build a vertical representation with bit vectors of transactions.
+tracts  reduced transaction database as a list of pairs
+        (transaction as a frozenset, weight)
+returns a triple (tadb, wgts, bits) of a list of triples (support,
+        item, bit vector of transactions), a list of pairs (weight,
+        bit mask) of the transaction weights (or None if all bits
+        have weight 1; if it is cheaper, a transaction of weight w
+        is represented by w bits instead of one weighted bit) and
+        a list of pairs (transaction, weight) per bit'''
+    wgts = dict()               # collect the transaction weights
+    for t,w in tracts: wgts[w] = wgts.get(w, 0) +1
+    tracts = sorted(tracts, key=lambda x: x[1])
+    unary  = sum([w for t,w in tracts]) <= len(wgts)*len(tracts)
+    tids   = dict(); b = 0      # initialize the item bit positions
+    bits   = []                 # and the transactions per bit
+    for t,w in tracts:          # traverse the transactions
+        n = w if unary else 1   # get the number of bits to use
+        for i in t: tids.setdefault(i, []).append((b, n))
+        b += n                  # note the bits of the transaction
+        bits += [(t, 1)]*n if unary else [(t, w)]
+    wgts = None                 # for unary weights no masks needed
+    if not unary:               # build the weight masks: since the
+        wgts = dict(); b = 0    # transactions are sorted by weight,
+        for t,w in tracts:      # each mask is a range of bits
+            if w not in wgts: wgts[w] = [b, b]
+            wgts[w][1] = b = b+1
+        wgts = [(w, ((1 << e-a) -1) << a) for w,(a,e) in wgts.items()]
+        if len(wgts) == 1 and wgts[0][0] == 1: wgts = None
+    tadb = []                   # build the bit vectors per item
+    for i in tids:              # (by collecting bit runs)
+        t = 0                   # traverse the items
+        for a,n in tids[i]: t |= ((1 << n) -1) << a
+        tadb.append([bitsupp(t, wgts), i, t])
+    return tadb, wgts, bits     # return the vertical representation
+
+#-----------------------------------------------------------------------
+
+def eclinit (recfn, tadb, pexs, data, args):
+    '''Initialize a process for parallel mining (see eclpar()).
+recfn   recursion function (recurse, recdiff or recbits)
+tadb    transaction database in vertical representation
+pexs    perfect extensions of the empty item set
+data    static recursion/output data as a list
+args    additional arguments of the recursion function'''
+    global ECLARGS              # store the mining arguments
+    ECLARGS = (recfn, tadb, pexs, data, args)
+
+#-----------------------------------------------------------------------
+
+def eclproc (sel):
+    '''Function for parallel mining of a part of the search tree.
+sel     ranges (a,b) of the items/branches to process per level
+returns a pair (number of item sets, found item sets/spectrum)'''
+    recfn, tadb, pexs, data, args = ECLARGS
+    data = data[:]; data[5] = 0 # get a fresh output destination
+    if data[6] is not None: data[6] = data[6].__class__()
+    recfn(tadb, [], pexs, set(), data, *args, sel=sel)
+    return (data[5], data[6])   # mine the part of the search tree
+
+#-----------------------------------------------------------------------
+
+def eclpar (recfn, tadb, pexs, data, args, cpus):
+    '''Mine the branches of the search tree with a pool of processes.
+recfn   recursion function (recurse, recdiff or recbits)
+tadb    transaction database in vertical representation
+pexs    perfect extensions of the empty item set
+data    static recursion/output data as a list
+        [ target, supp, zmin, zmax, maxx, count, out, algo, border,
+          tids, bits ]
+args    additional arguments of the recursion function
+cpus    number of processes to use
+returns the maximum extension support (as the recursion functions)
+
+Each process mines whole branches of the search tree (one item of the
+database with all its extensions), or parts of a branch (ranges of the
+extension items), if the branch is expected to be much more expensive
+than the others. The work of a branch is estimated from the support of
+its item and the number of items following it in the processing order.
+The closed/maximal checks remain exact, because each part starts with
+all items preceding it as eliminated items.'''
+    tadb.sort()                 # sort items by (conditional) support
+    n    = len(tadb)            # estimate the work per branch
+    work = [s*(n-k) for k,(s,i,t) in enumerate(tadb)]
+    q    = sum(work)/(4.0*cpus) # desired work per part
+    sels = []                   # collect the parts of the search tree
+    for k in sorted(range(n), key=lambda k: -work[k]):
+        c = min(n-k-1, int(ceil(work[k]/q)))
+        if c <= 1: sels.append([(k,k+1)]); continue
+        sels += [[(k,k+1), ((n-k-1)*j//c, (n-k-1)*(j+1)//c)]
+                 for j in range(c)]  # split expensive branches
+    out  = data[6]              # note the output destination
+    tmpl = data[:]              # with a list for file output
+    if out is not None and not isinstance(out, dict().__class__):
+        tmpl[6] = []            # (item sets are written by parent)
+    pool = Pool(cpus, eclinit, (recfn, tadb, pexs, tmpl, args))
+    try:                        # mine the parts in parallel
+        for c,x in pool.imap(eclproc, sels):
+            data[5] += c        # sum the number of item sets
+            if   out is None: continue
+            elif isinstance(out, dict().__class__):
+                for s in x: out[s] = out.get(s, 0) +x[s]
+            elif isinstance(out, [].__class__):
+                out.extend(x)   # merge spectrum or item sets
+            else:               # write found item sets to a file
+                for iset,supp in x:
+                    for i in iset: out.write(str(i)+' ')
+                    out.write('('+str(supp)+')\n')
+        pool.close()            # close the process pool
+    finally:                    # and wait for the processes
+        pool.terminate(); pool.join()
+    return max([s for s,i,t in tadb]+[0])
+
+#-----------------------------------------------------------------------
+
+def eclprep (tracts, target, supp, zmin, zmax, out, algo, border):
+    '''Prepare the transaction database for the eclat algorithm.
+tracts  transaction database to mine
+target  type of frequent item sets to find
+supp    minimum support of an item set
+zmin    minimum number of items per item set
+zmax    maximum number of items per item set
+out     output file, list or dictionary as a destination
+algo    representation of transaction sets
+border  support border for filtering item sets
+        (for details of the parameters see the function eclat())
+returns None if no item set can be frequent, otherwise a tuple
+        (recfn, tadb, pexs, sall, data, args, r) of the recursion
+        function (recurse, recdiff or recbits), the (pruned)
+        transaction database in vertical representation, the perfect
+        extensions of the empty set, the total transaction weight,
+        the static recursion/output data as a list, the additional
+        arguments of the recursion function and the maximum support
+        of an item (if the database got pruned to an empty one)'''
+    supp = -supp if supp < 0 else int(ceil(0.01*supp*len(tracts)))
+    if supp <= 0: supp = 1      # check and adapt the minimum support
+    if zmax <  0: zmax = maxsize# and the maximum item set size
+    if   algo in ['tidset','tidsets']: algo = 't'
+    elif algo in ['bit','bits']:       algo = 'b'
+    elif algo in ['diffset','diffsets']: algo = 'd'
+    if algo not in ['t','b','d']:      algo = 't'
+    if len(tracts) < supp:      # check whether any set can be frequent
+        return None
+    tadb = dict()               # reduce by combining equal transactions
+    for t in [frozenset(t) for t in tracts]:
+        if t in tadb: tadb[t] += 1
+        else:         tadb[t]  = 1
+    tracts = list(tadb.items()) # get reduced transactions
+    if algo == 'b':             # if to use bit vectors
+        tadb, wgts, bits = bittadb(tracts)
+    else:                       # if to use sets of transactions
+        items  = set().union(*[t for t,w in tracts])
+        tadb   = dict([(i,[]) for i in items])
+        for t in tracts:        # collect transactions per item
+            for i in t[0]: tadb[i].append(t)
+        tadb = [[sum([w for t,w in tadb[i]]), i, set(tadb[i])]
+                for i in tadb]  # build and filter transaction sets
+        bits   = None           # (no transactions per bit needed)
+    sall = sum([w for t,w in tracts])
+    pexs = [i for s,i,t in tadb if s >= sall]
+    tadb = [t for t in tadb if t[0] >= supp and t[0] < sall]
+    maxx = zmax+1 if zmax < maxsize and target in 'cm' else zmax
+    if isinstance(out, (0).__class__): out = None
+    tids = dict([(i,t) for s,i,t in tadb]) if target in 'cm' else None
+    data = [target, supp, zmin, zmax, maxx, 0, out, algo,
+            list(border) if border else [], tids, bits]
+    r = prune(tadb, 0, len(pexs), data) if tadb and data[8] else 0
+    if   algo == 'b':           # if to use bit vectors
+        recfn, args = recbits, (wgts,)
+    elif algo == 'd' and tadb and dense(tadb, set(tracts)):
+        t = set(tracts)         # if the database is dense, start
+        tadb = [[s,i,t-u] for s,i,u in tadb]    # with diffsets
+        recfn, args = recdiff, (t,)
+    else:                       # if to use sets of transactions
+        recfn, args = recurse, ()
+    return (recfn, tadb, pexs, sall, data, args, r)
+
+#-----------------------------------------------------------------------
+
+def eclat (tracts, target='s', supp=2, zmin=1, zmax=maxsize, out=0,
+           algo='t', border=None, cpus=1):
     '''Find frequent item set with the eclat algorithm.
 tracts  transaction database to mine (mandatory)
         The database must be a list or a tuple of transactions;
@@ -116,48 +593,59 @@ supp    minimum support of an item set         (default: 2)
         (positive: percentage, negative: absolute number)
 zmin    minimum number of items per item set   (default: 1)
 zmax    maximum number of items per item set   (default: no limit)
-out     output file or list as a destination   (default: None)
+out     output file, list or dictionary as a destination
+        (a dictionary receives the pattern spectrum, that is,
+        it maps (size, support) to the number of item sets;
+        perfect extensions are counted, not enumerated)
+algo    representation of transaction sets     (default: 't')
+        t     tidsets    Python sets of (transaction, weight) pairs
+        b     bits       bit vectors (Python integers), support
+                         computed as a (weighted) bit count
+        d     diffsets   tidsets, but switch to diffsets (lost
+                         transactions relative to the prefix) in
+                         dense conditional databases (dEclat)
+border  support border for filtering item sets (default: None)
+        Must be a list or tuple of (absolute) support values per
+        item set size (to be accessed by the size of the item set);
+        it is also used to prune the search (as, e.g., created by
+        the function psp2bdr() of the module patspec).
+cpus    number of processes to use             (default: 1)
+        (cpus <= 0: determine number of cores automatically;
+        the branches of the search tree are mined in parallel)
 returns if a parameter 'out' is a list, the return value is a list of
         pairs (i.e. tuples with two elements), each consisting of a
         found frequent item set (as a tuple of items) and this item
-        set's (absolute) support, otherwise (if the parameter 'out'
-        is not a list) the number of found (frequent) item sets.'''
-    supp = -supp if supp < 0 else int(ceil(0.01*supp*len(tracts)))
-    if supp <= 0: supp = 1      # check and adapt the minimum support
-    if zmax <  0: zmax = maxsize# and the maximum item set size
-    if len(tracts) < supp:      # check whether any set can be frequent
-        return out if isinstance(out, [].__class__) else 0
-    tadb = dict()               # reduce by combining equal transactions
-    for t in [frozenset(t) for t in tracts]:
-        if t in tadb: tadb[t] += 1
-        else:         tadb[t]  = 1
-    tracts = tadb.items()       # get reduced trans. and collect items
-    items  = set().union(*[t for t,w in tracts])
-    tadb   = dict([(i,[]) for i in items])
-    for t in tracts:            # collect transactions per item
-        for i in t[0]: tadb[i].append(t)
-    tadb = [[sum([w for t,w in tadb[i]]), i, set(tadb[i])]
-            for i in tadb]      # build and filter transaction sets
-    sall = sum([w for t,w in tracts])
-    pexs = [i for s,i,t in tadb if s >= sall]
-    tadb = [t for t in tadb if t[0] >= supp and t[0] < sall]
-    maxx = zmax+1 if zmax < maxsize and target in 'cm' else zmax
-    data = [target, supp, zmin, zmax, maxx, 0]
-    if not isinstance(out, (0).__class__): data.append(out)
-    r = recurse(tadb, [], pexs, [], data)
-    if len(pexs) >= zmin:       # recursively find frequent item sets
+        set's (absolute) support, if it is a dictionary, the pattern
+        spectrum, otherwise (if the parameter 'out' is neither a
+        list nor a dictionary) the number of found (frequent) item
+        sets.'''
+    x = eclprep(tracts, target, supp, zmin, zmax, out, algo, border)
+    if x is None:               # check whether any set can be frequent
+        return out if isinstance(out, ([].__class__, dict().__class__)) \
+               else 0
+    recfn, tadb, pexs, sall, data, args, r = x
+    if cpus <= 0:               # get the number of cpus
+        try:                        cpus = cpu_count()
+        except NotImplementedError: cpus = 1
+    if   not tadb: pass         # mine (in parallel if requested)
+    elif cpus > 1 and len(tadb) > 1:
+        r = eclpar(recfn, tadb, pexs, data, args, cpus)
+    else:                       # if to mine in the current process
+        r = recfn(tadb, [], pexs, set(), data, *args)
+    if len(pexs) >= data[2]:    # recursively find frequent item sets
         if   target == 'm':     # if to report only maximal item sets
-            if r < supp: report(pexs, [], sall, data)
+            if r < data[1]: report(pexs, [], sall, data)
         elif target == 'c':     # if to report only closed  item sets
-            if r < s:    report(pexs, [], sall, data)
+            if r < sall:    report(pexs, [], sall, data)
         else:                   # if to report all frequent item sets
             report([], pexs, sall, data)  # report the empty item set
-    if isinstance(out, [].__class__): return out
+    if isinstance(out, ([].__class__, dict().__class__)): return out
     return data[5]              # return (number of) found item sets
 
 #-----------------------------------------------------------------------
 
-def fim (tracts, target='s', supp=2, zmin=1, zmax=maxsize):
+def fim (tracts, target='s', supp=2, zmin=1, zmax=maxsize, report='a',
+         algo='t', border=None, cpus=1):
     '''Find frequent item set with the eclat algorithm.
 tracts  transaction database to mine (mandatory)
         The database must be a list or a tuple of transactions;
@@ -171,21 +659,178 @@ supp    minimum support of an item set         (default: 2)
         (positive: percentage, negative: absolute number)
 zmin    minimum number of items per item set   (default: 1)
 zmax    maximum number of items per item set   (default: no limit)
+report  values to report with an item set      (default: 'a')
+        a     absolute item set support (number of transactions)
+        #     pattern spectrum as a dictionary (no item sets)
+        =     pattern spectrum as a list of triplets
+algo    representation of transaction sets     (default: 't')
+        t     tidsets    Python sets of (transaction, weight) pairs
+        b     bits       bit vectors (Python integers)
+        d     diffsets   tidsets/diffsets (dense databases)
+border  support border for filtering item sets (default: None)
+        (minimum support per item set size, see eclat())
+cpus    number of processes to use             (default: 1)
+        (cpus <= 0: determine number of cores automatically)
 returns returns a list of pairs (i.e. tuples with two elements),
         each consisting of a found frequent item set (as a tuple of
-        items) and this item set's (absolute) support.'''
-    return eclat(tracts, target, supp, zmin, zmax, [])
+        items) and this item set's (absolute) support, or (report
+        '#' or '=') a pattern spectrum as a dictionary mapping pairs
+        (size, support) to the number of found item sets or as a
+        sorted list of triplets (size, support, count).'''
+    if report not in ['#','=']: # if to report item sets
+        return eclat(tracts, target, supp, zmin, zmax, [], algo,
+                     border, cpus)
+    psp = eclat(tracts, target, supp, zmin, zmax, dict(), algo,
+                border, cpus)
+    if report == '#': return psp# return the pattern spectrum
+    return sorted([(z,c,psp[z,c]) for z,c in psp])
+
+#-----------------------------------------------------------------------
+
+def subsets (iset, pexs, supp, data):
+    '''Generate the item sets with the same support (non-recursive).
+iset    base item set to report (list of items)
+pexs    perfect extensions of the base item set (list of items)
+supp    (absolute) support of the item sets to report
+data    static recursion/output data as a list
+        (see the function report(); the output is ignored)
+returns a generator of pairs (item set as a tuple, support) of the
+        base item set combined with each subset of the perfect
+        extensions that is admissible (size range and border)'''
+    n = len(iset)               # traverse the admissible sizes
+    for z in range(max(n, data[2]), min(n+len(pexs), data[3])+1):
+        if z < len(data[8]) and supp < data[8][z]:
+            continue            # check the support border
+        for x in combinations(pexs, z-n):
+            yield (tuple(iset)+x, supp)
+
+#-----------------------------------------------------------------------
+
+def iter_fim (tracts, target='s', supp=2, zmin=1, zmax=maxsize,
+              algo='t', border=None):
+    '''Find frequent item sets with the eclat algorithm (generator).
+tracts  transaction database to mine (mandatory)
+target  type of frequent item sets to find     (default: 's')
+supp    minimum support of an item set         (default: 2)
+zmin    minimum number of items per item set   (default: 1)
+zmax    maximum number of items per item set   (default: no limit)
+algo    representation of transaction sets     (default: 't')
+border  support border for filtering item sets (default: None)
+        (for details of the parameters see the function eclat())
+returns a generator of pairs (i.e. tuples with two elements), each
+        consisting of a found frequent item set (as a tuple of items)
+        and this item set's (absolute) support
+
+The search tree is traversed with an explicit stack instead of the
+recursion of the function eclat(), so that neither the recursion
+limit nor the number of found item sets restricts the search. Each
+item set is generated as soon as it is found (before its extensions,
+since the maximum support of an extension is known from the
+projection), so that item sets can be processed in constant memory.'''
+    x = eclprep(tracts, target, supp, zmin, zmax, None, algo, border)
+    if x is None: return        # check whether any set can be frequent
+    recfn, tadb, pexs, sall, data, args, rmax = x
+    target, supp = data[0], data[1]
+    cm    = target in 'cm'      # whether closed/maximal check needed
+    elim  = set()               # set of eliminated items
+    if tadb: rmax = max([s for s,i,t in tadb])
+    stack = []                  # stack of search tree nodes as lists
+    if tadb:                    # [recfn, tadb, iset, pexs, args, k,
+        tadb.sort()             #  eliminated items, pending item]
+        stack.append([recfn, tadb, [], pexs, args, 0, [], None])
+    while stack:                # traverse the search tree
+        node = stack[-1]        # get the current node
+        recfn, tadb, iset, pexs, args, k, xelm, p = node
+        if p is not None:       # if the subtree of an item is done,
+            elim.add(p); xelm.append(p); node[7] = None
+        if k >= len(tadb):      # if all items have been processed,
+            elim.difference_update(xelm)    # remove elim. items
+            stack.pop(); continue           # and the node itself
+        node[5] = k+1           # advance to the next item
+        proj = []; xpxs = []    # construct the projection of the
+        if   recfn is recbits:  # trans. database to the current item
+            s,i,t = tadb[k]; wgts = args[0]
+            if cm and not bitclosed(t, elim, data[9], data[10]):
+                continue        # check for a perfect extension
+            for r,j,u in tadb[k+1:]:
+                u = u & t; r = bitsupp(u, wgts)
+                if   r >= s:    xpxs.append(j)
+                elif r >= supp: proj.append([r,j,u])
+            cargs = args        # intersect with subsequent vectors
+        elif recfn is recdiff:  # if to use diffsets
+            s,i,d = tadb[k]; t = None   # (see function recdiff())
+            if cm and elim:     # if to check for a perfect extension
+                for x in args[0]:
+                    if x not in d: break
+                if not elim.isdisjoint(x[0]):
+                    t = args[0] -d
+                    if not closed(t, elim, data[9]): continue
+            for r,j,e in tadb[k+1:]:
+                e = e - d; r = s -sum([w for x,w in e])
+                if   r >= s:    xpxs.append(j)
+                elif r >= supp: proj.append([r,j,e])
+            if cm and t is None: t = args[0] -d
+            cargs = (t,)        # get lost transactions
+        else:                   # if to use sets of transactions
+            s,i,t = tadb[k]     # unpack the item information
+            if cm and not closed(t, elim, data[9]):
+                continue        # check for a perfect extension
+            for r,j,u in tadb[k+1:]:
+                u = u & t; r = sum([w for x,w in u])
+                if   r >= s:    xpxs.append(j)
+                elif r >= supp: proj.append([r,j,u])
+            cargs = ()          # intersect with subsequent lists
+        xpxs = pexs +xpxs       # combine perfect extensions and
+        xset = iset +[i]        # add the current item to the set
+        n    = len(xpxs) if cm else 0
+        if not proj or len(xset)+n >= data[4]:
+            r = 0; proj = []    # check whether to descend
+        else:                   # get the maximum extension support
+            r = max([x[0] for x in proj])
+            if data[8]: prune(proj, len(xset), len(xpxs), data)
+        if   target == 'm':     # if to report only maximal item sets
+            if r < supp and (bitmaximal(t, elim, supp, args[0],
+                                        data[9], data[10], s)
+                             if recfn is recbits else
+                             maximal(t, elim, supp, data[9], s)):
+                for x in subsets(xset+xpxs, [], s, data): yield x
+        elif target == 'c':     # if to report only closed  item sets
+            if r < s:
+                for x in subsets(xset+xpxs, [], s, data): yield x
+        else:                   # if to report all frequent item sets
+            for x in subsets(xset, xpxs, s, data): yield x
+        if not proj:            # if there are no extensions,
+            if cm: elim.add(i); xelm.append(i)  # eliminate the item
+            continue            # and go to the next item
+        if recfn is recurse and data[7] == 'd' and dense(proj, t):
+            proj  = [[r,j,t-u] for r,j,u in proj]
+            recfn = recdiff; cargs = (t,)   # switch to diffsets
+        proj.sort()             # sort items by (conditional) support
+        node[7] = i             # eliminate item after its subtree
+        stack.append([recfn, proj, xset, xpxs, cargs, 0, [], None])
+    if len(pexs) < data[2]: return  # check the root perfect extensions
+    if   target == 'm':         # if to report only maximal item sets
+        if rmax >= supp: return
+        iset, pexs = pexs, []
+    elif target == 'c':         # if to report only closed  item sets
+        if rmax >= sall: return
+        iset, pexs = pexs, []
+    else:                       # if to report all frequent item sets
+        iset = []               # (subsets of the perfect extensions)
+    for x in subsets(iset, pexs, sall, data): yield x
 
 #-----------------------------------------------------------------------
 
 if __name__ == '__main__':
     desc    = 'find frequent item sets (with the eclat algorithm)'
-    version = 'version 1.3 (2017.06.02)         ' \
+    version = 'version 1.4 (2026.10.18)         ' \
             + '(c) 2013-2017   Christian Borgelt'
     opts    = {'t': ['target', 's'],
                'm': ['zmin',    1 ],
                'n': ['zmax',   -1 ],
-               's': ['supp',   10 ] }
+               's': ['supp',   10 ],
+               'a': ['algo',   't'],
+               'Z': ['cpus',    1 ] }
     fixed   = []                # list of program options
 
     if len(argv) <= 1:          # if no arguments are given
@@ -203,6 +848,13 @@ if __name__ == '__main__':
                       +'(default: '  +str(opts['s'])+'%)')
         print('         (positive: percentage, '
                       +'negative: absolute number)')
+        print('-a#      representation of transaction sets     '
+                      +'(default: '  +str(opts['a'])+')')
+        print('         (t: sets of transactions, b: bit vectors,')
+        print('          d: sets/diffsets for dense databases)')
+        print('-Z#      number of processes to use             '
+                      +'(default: '  +str(opts['Z'])+')')
+        print('         (0: determine number of cores automatically)')
         print('infile   file to read transactions from         '
                       +'[required]')
         print('outfile  file to write frequent item sets to    '
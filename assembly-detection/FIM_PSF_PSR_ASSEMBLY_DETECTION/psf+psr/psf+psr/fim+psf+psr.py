@@ -8,17 +8,56 @@
 #           2014.05.12 pattern spectrum border passed to fim
 #           2015.08.12 adapted to modified pattern set reduction
 #           2015.09.04 adapted to modified value report behavior
+#           2026.10.18 buffered (block-wise) record reader added
+#           2026.10.18 items coded as integers for mining/reduction
+#           2026.10.18 memory-mapped binary activity rasters added
+#           2026.10.18 fallback to pure Python fim (pyfim) added
+#           2026.10.18 patterns streamed to output with pyfim.iter_fim
+#           2026.10.18 surrogates generated with patspec.fimpsp
+#           2026.10.18 option -p for shards (ranges of surrogates)
+#           2026.10.18 options -K and -L for a pattern spectrum cache
+#           2026.10.18 option -w for checkpoints (resume/extend)
+#           2026.10.18 options -a and -T for adaptive early stopping
+#           2026.10.18 binary pattern spectrum files (extension .pspb)
+#           2026.10.18 options -H, -X and -A for histogram-based borders
+#           2026.10.18 estimation (-g e) without the compiled module
+#           2026.10.18 surrogates without the compiled module (numpy)
+#           2026.10.18 items coded canonically (text and binary rasters)
 #-----------------------------------------------------------------------
 from sys     import argv, stderr, path, version_info
-from os.path import join
+from os.path import join, dirname, abspath
 from time    import time
 from math    import floor, ceil
-from fim     import fim, genpsp, estpsp, psp2bdr, patred
+from re      import compile as recomp, escape
+from codecs  import getincrementaldecoder
+from mmap    import mmap, ACCESS_READ
+from struct  import Struct
+FIMDIR = join(dirname(abspath(__file__)), '..', 'fim')
+if FIMDIR not in path: path.insert(0, FIMDIR)
+try:                            # prefer the compiled fim module
+    from fim     import fim, estpsp, psp2bdr, patred
+    PYFIM    = False            # (pure Python fim not needed)
+    havesurr = True             # (surrogates with fim.genpsp())
+except ImportError:             # fall back to pure Python functions
+    from pyfim   import fim, iter_fim   # (eclat, border pruning)
+    from patspec import psp2bdr
+    from patred  import patred
+    from patspec import estpsp  # (vectorized estimation with numpy)
+    import patspec              # (surrogates need numpy)
+    PYFIM    = True             # (pure Python fim mines in parallel)
+    havesurr = patspec.gensurr is not None
+from patspec import fimpsp      # seeds per surrogate (reproducible)
+from patspec import pspread, pspwrite   # (text or binary files)
+from patspec import hstread, hstwrite, hst2psp, hst2bdr
+from patspec import pspkey, cacheget, cacheput
 
 #-----------------------------------------------------------------------
 # Constants
 #-----------------------------------------------------------------------
 oo = float('inf')               # positive infinity as a constant
+RSTHDR = Struct('<4sBBHII')     # header of a binary activity raster:
+RSTMAGIC = b'FIMR'              # magic, version, packing, (reserved),
+                                # number of rows and number of columns
 
 #-----------------------------------------------------------------------
 # File Reading Function
@@ -54,6 +93,123 @@ returns a list of the fields read or None at end of file'''
         c = f.read(1).decode()  # consume field separator
     return rec                  # return the record
 
+#-----------------------------------------------------------------------
+
+def getrecs (f, recseps, fldseps, blanks, comment, bufsize=65536):
+    '''Read all records from a file block-wise and split them into fields.
+f       file to read from (opened in binary mode)
+recseps record  separators
+fldseps field   separators
+blanks  blank   characters
+comment comment characters
+bufsize size of the blocks to read (in bytes)
+returns a generator yielding the records as lists of fields
+        (the same records as repeated calls of getrec(), provided
+        no blank character is also used as a record separator)'''
+    dec  = getincrementaldecoder('utf-8')()
+    rsep = recomp('[%s]' % escape(recseps))
+    fsep = recomp('[%s]' % escape(fldseps)) if fldseps else None
+    xblk = [c for c in blanks if c not in fldseps]
+    sep  = fldseps[:1]          # get blanks that are no separators
+    tab  = dict([(ord(c), sep) for c in fldseps[1:]])
+    rest = ''                   # init. incomplete last record
+    while 1:                    # block read loop
+        buf  = f.read(bufsize)  # read and decode the next block
+        text = rest +dec.decode(buf, not buf)
+        fast = sep and not [c for c in xblk if c in text]
+        if fast:                # if no field needs stripping,
+            text = text.translate(tab)  # map all field separators
+        recs = rsep.split(text) # to one character and
+        rest = recs.pop()       # split the block into records
+        if not buf and rest:    # at the end of the file a non-empty
+            recs.append(rest)   # last record is complete
+        for rec in recs:        # traverse the complete records
+            if rec and rec[0] in comment:
+                continue        # skip comment records
+            if fast:            # if fields need no stripping,
+                rec = rec.split(sep)   # split at the separator
+            else:               # if fields may need stripping
+                rec = fsep.split(rec) if fsep else [rec]
+                rec = [fld.strip(blanks) for fld in rec]
+            yield [fld for fld in rec if fld]
+        if not buf: return      # remove empty fields, yield record
+                                # and abort at the end of the file
+
+#-----------------------------------------------------------------------
+
+def canon (tracts, names, keep=False):
+    '''Code the items of a transaction database canonically.
+tracts  list of transactions (tuples of integer item codes)
+names   list of item names (indexed by item code)
+keep    whether to keep the order of the items in the transactions
+        (e.g. for table-derived data, with items in column order)
+returns a pair (names, tracts) of the names of the occurring items,
+        sorted numerically if all names are integer numbers and as
+        strings otherwise, and the transactions with the items coded
+        by their position in this order (sorted unless keep is true)
+
+The codes depend neither on the order in which the items first occur
+nor on the input format (text file or binary raster), so that the
+same data always yields the same transactions (and thus the same
+pattern spectra, cache keys and shards for the same seed).'''
+    used = sorted(set([i for t in tracts for i in t]))
+    try:                        # sort the names of the items
+        used.sort(key=lambda i: int(names[i]))
+    except ValueError:          # (numerically or as strings)
+        used.sort(key=lambda i: names[i])
+    code = dict([(i,k) for k,i in enumerate(used)])
+    if keep: tracts = [tuple([code[i] for i in t]) for t in tracts]
+    else:    tracts = [tuple(sorted([code[i] for i in t])) for t in tracts]
+    return [names[i] for i in used], tracts
+
+#-----------------------------------------------------------------------
+
+def israster (fname):
+    '''Check whether a file contains a binary activity raster.
+fname   name of the file to check
+returns whether the file starts with the binary raster magic'''
+    with open(fname, 'rb') as inp:
+        return inp.read(len(RSTMAGIC)) == RSTMAGIC
+
+#-----------------------------------------------------------------------
+
+def getraster (fname):
+    '''Read the transactions from a binary activity raster.
+fname   name of the file to read from
+        The file consists of a 16 byte header (see RSTHDR: magic
+        'FIMR', version 1, packing, two reserved bytes, number T of
+        rows/time bins and number N of columns/neurons, all little
+        endian) followed by the T x N raster in row-major order.
+        packing 0: one byte per entry (non-zero: active)
+        packing 1: packed bits, ceil(N/8) bytes per row, most
+                   significant bit first (as numpy.packbits())
+returns a pair (N, tracts), with tracts a list of transactions, each
+        a tuple of the (0-based) columns active in a (non-empty) row'''
+    with open(fname, 'rb') as inp:
+        mm = mmap(inp.fileno(), 0, access=ACCESS_READ)
+    try:                        # map the file into memory
+        magic, vers, pack, x, T, N = RSTHDR.unpack_from(mm, 0)
+        if magic != RSTMAGIC or vers != 1 or pack not in (0,1):
+            raise ValueError('%s is no binary raster' % fname)
+        B = (N+7)//8 if pack else N
+        if len(mm) < RSTHDR.size +T*B:
+            raise ValueError('binary raster %s is truncated' % fname)
+        bits = [tuple([o for o in range(8) if b & (0x80 >> o)])
+                for b in range(256)]  # bit offsets per byte value
+        tracts = []             # initialize the transactions
+        for r in range(RSTHDR.size, RSTHDR.size +T*B, B):
+            row = mm[r:r+B]     # traverse the rows of the raster
+            if not row.strip(b'\0'): continue
+            if pack:            # if the columns are packed bits
+                t = [(j << 3) +o for j,b in enumerate(row) if b
+                                 for o in bits[b]]
+            else:               # if the columns are single bytes
+                t = [j for j,b in enumerate(row) if b]
+            tracts.append(tuple(t))
+    finally:                    # collect the active columns
+        mm.close()              # and unmap the file
+    return N, tracts            # return the transactions
+
 #-----------------------------------------------------------------------
 # Main Program
 #-----------------------------------------------------------------------
@@ -80,6 +236,10 @@ if __name__ == '__main__':
                'S': ['seed',  0    ],  # seed for random numbers
                'c': ['cnt',   1000 ],  # number of data sets
                'Z': ['cpus',  0    ],  # number of cores/cpus to use
+               'p': ['part',  ''   ],  # range of surrogate data sets
+               'w': ['ckpt',  ''   ],  # checkpoint file (raw counts)
+               'a': ['stable', 0   ],  # surrogates with stable border
+               'T': ['tmax',  0.0  ],  # time budget for surrogates
                'R': ['pred',  'L'  ],  # pattern set reduction
                'q': ['pssep', ' '  ],  # pattern spectrum separator
                'h': ['ishdr', ''   ],  # record header  for output
@@ -89,7 +249,13 @@ if __name__ == '__main__':
                'f': ['fldseps', ' ,\\t' ],   # field   separators
                'b': ['blanks',  ' \\t\\r' ], # blank   characters
                'C': ['comment', '#' ],       # comment characters
-               'P': ['pspfn',  ''  ] } # name of pattern spectrum file
+               'B': ['bufsize', 65536 ],     # read buffer size
+               'P': ['pspfn',  ''  ],  # name of pattern spectrum file
+               'K': ['cache',  ''  ],  # pattern spectrum cache directory
+               'L': ['csize',  256 ],  # maximum cache size (in MB)
+               'H': ['hstfn',  ''  ],  # name of histogram file
+               'X': ['crit',   'x' ],  # criterion for the border
+               'A': ['level', 0.05 ] } # significance level for border
 
     if len(argv) <= 1:          # if no arguments are given
         opts = dict([(o,opts[o][1]) for o in opts])
@@ -122,6 +288,23 @@ if __name__ == '__main__':
                       +'(default: %d)' % opts['c'])
         print('         (if <= 0, the pattern spectrum is read '
                       +'from a file)')
+        print('-p#:#    only generate surrogate data sets a to b-1 '
+                      +'(default: all)')
+        print('         (write an unnormalized shard to the pattern '
+                      +'spectrum file,')
+        print('         which also serves as a checkpoint file,')
+        print('         merge shards with "patspec.py -m outfile '
+                      +'shards...")')
+        print('-a#      stop once the border is stable for # '
+                      +'surrogates (default: %d)' % opts['a'])
+        print('-T#      time budget for surrogates (in seconds)  '
+                      +'(default: %g)' % opts['T'])
+        print('         (-a, -T: 0 means no limit; with a limit -c is '
+                      +'a maximum)')
+        print('-w#      checkpoint file for surrogate generation '
+                      +'(default: none)')
+        print('         (an existing file is resumed/extended, '
+                      +'e.g. to a larger -c)')
         print('-Z#      number of cpus/processor cores to use  '
                       +'(default: %g)' % opts['Z'])
         print('         (a value <= 0 means all cpus reported '
@@ -155,6 +338,28 @@ if __name__ == '__main__':
                       +'(default: %d)' % opts['S'])
         print('-P#      name of pattern spectrum file          '
                       +'(default: none)')
+        print('         (binary file if the name ends in .pspb)')
+        print('-H#      name of per-signature histogram file   '
+                      +'(default: none)')
+        print('         (written with surrogates, read otherwise)')
+        print('-X#      criterion for the decision border      '
+                      +'(default: %s)' % opts['X'])
+        print('         x     no surrogate has a pattern with the '
+                      +'signature')
+        print('         q     at most a fraction -A of the surrogates '
+                      +'has one')
+        print('         p     at most a fraction -A has one with larger '
+                      +'size/support')
+        print('         b     like p, with Bonferroni correction')
+        print('-A#      significance level for the border      '
+                      +'(default: %g)' % opts['A'])
+        print('-K#      directory of pattern spectrum cache    '
+                      +'(default: none)')
+        print('         (spectra are identified by a hash of the data '
+                      +'and parameters;')
+        print('         only used with a seed, i.e. if -S is not 0)')
+        print('-L#      maximum size of the cache in megabytes '
+                      +'(default: %d)' % opts['L'])
         print('-q#      column separator for pattern spectrum  '
                       +'(default: "%s")' % opts['q'])
         print('-h#      record  header for output              '
@@ -171,8 +376,13 @@ if __name__ == '__main__':
                       +'(default: "%s")' % opts['b'])
         print('-C#      comment characters                     '
                       +'(default: "%s")' % opts['C'])
+        print('-B#      buffer size for reading the input file '
+                      +'(default: %d)' % opts['B'])
+        print('         (if <= 0, the file is read character-wise)')
         print('infile   file to read transactions from         '
                       +'[required]')
+        print('         (text file or binary activity raster, '
+                      +'see getraster())')
         print('outfile  file to write found item sets to       '
                       +'[optional]')
         exit()                  # print usage message and abort
@@ -207,6 +417,10 @@ if __name__ == '__main__':
     seed    = opts['seed']      # random seed (0: use time)
     cnt     = opts['cnt']       # number of surrogate data sets
     cpus    = opts['cpus']      # number of cpus/cores to use
+    part    = opts['part']      # range of surrogate data sets
+    ckpt    = opts['ckpt']      # checkpoint file name
+    stable  = opts['stable']    # surrogates with stable border
+    tmax    = opts['tmax']      # time budget for surrogates
     pred    = opts['pred']      # pattern set reduction method
     pssep   = opts['pssep']     # pattern spectrum separator
     ishdr   = opts['ishdr']     # record header  for output
@@ -216,15 +430,43 @@ if __name__ == '__main__':
     fldseps = opts['fldseps']   # field   separators
     blanks  = opts['blanks']    # blank   characters
     comment = opts['comment']   # comment characters
+    bufsize = opts['bufsize']   # buffer size for reading
     pspfn   = opts['pspfn']     # pattern spectrum file name
+    cache   = opts['cache']     # pattern spectrum cache directory
+    csize   = opts['csize']     # maximum size of the cache
+    hstfn   = opts['hstfn']     # name of histogram file
+    crit    = opts['crit']      # criterion for the border
+    level   = opts['level']     # significance level for border
     if zmin <= 0: error('invalid minimum size %d\n'    % zmin)
     if surr not in 'xirpse':    # check surrogate generation method
         error('invalid surrogate data generation %s\n' % surr)
     if pred not in 'xcCisSlLtT':# check pattern set reduction
         error('invalid pattern set reduction %s\n'     % pred)
     if surr == 'x': cnt = 0     # adapt number of data sets
-    if cnt <= 0 and pspfn == '':# check for a pattern spectrum
+    if crit not in 'xqpb':      # check the border criterion
+        error('invalid border criterion %s\n'           % crit)
+    if cnt <= 0 and not (pspfn or hstfn):   # check for a spectrum
         error('need to generate surrogates or read pattern spectrum\n')
+    if cnt > 0 and not havesurr and surr != 'e':
+        error('generating surrogates needs the fim module or numpy\n')
+    if part:                    # check range of surrogate data sets
+        try:    part = tuple([int(x) for x in part.split(':')])
+        except ValueError: part = ()
+        if len(part) != 2 or not 0 <= part[0] < part[1] <= cnt:
+            error('invalid range of surrogate data sets %s\n'
+                  % opts['part'])
+        if surr in 'xie' or pspfn == '' or seed == 0:
+            error('shards need surrogates, a shard file and a seed\n')
+        if stable > 0 or tmax > 0:  # shards are normalized by cnt
+            error('shards cannot be stopped early\n')
+        ckpt = pspfn            # (the shard is also the checkpoint)
+    else: part = None           # generate all surrogate data sets
+    if ckpt and surr in 'xe':   # check for generated surrogates
+        error('checkpoints need surrogate data sets\n')
+    if crit != 'x' and cnt <= 0 and hstfn == '':
+        error('border criterion %s needs histograms\n' % crit)
+    if (hstfn or crit != 'x') and cnt > 0 and (surr == 'e' or part):
+        error('histograms need all surrogate data sets\n')
     x = [recseps,fldseps,blanks,comment]
     if version_info[0] >= 3:    # decode ASCII escape sequences
         x = [bytes(s, 'utf-8').decode('unicode_escape') for s in x]
@@ -235,17 +477,30 @@ if __name__ == '__main__':
     # --- read the data set to analyze ---
     t = time()                  # start timer, print log message
     stderr.write('reading %s ... ' % args[0])
-    items  = set()              # initialize the set of items
+    items  = dict()             # initialize the item map and
+    names  = []                 # the decode table (id -> name)
     tracts = []; k = 1          # initialize the transactions
-    with open(args[0], 'rb') as inp:
-        while 1:                # record read loop
-            rec = getrec(inp, recseps, fldseps, blanks, comment)
-            if rec == None: break
-            if not rec: continue# read the next record
-            items |= set(rec)   # collect items in a set
-            tracts.append(rec)  # and transactions in a list
+    if israster(args[0]):       # if the input is a binary raster,
+        n, tracts = getraster(args[0])  # get the transactions and
+        names = [str(i+1) for i in range(n)]  # the (1-based) columns
+    else:                       # if the input is a text file
+        with open(args[0], 'rb') as inp:
+            if bufsize > 0:     # if to read the file block-wise
+                recs = getrecs(inp, recseps, fldseps, blanks, comment,
+                               bufsize)
+            else:               # if to read the file character-wise
+                recs = iter(lambda: getrec(inp, recseps, fldseps,
+                                           blanks, comment), None)
+            for rec in recs:    # record read loop
+                if not rec: continue  # skip empty records
+                for i in rec:   # traverse the items of the record
+                    if i not in items:  # code new items with the
+                        items[i] = len(names)  # next integer id
+                        names.append(i) # and note name for decoding
+                tracts.append(tuple([items[i] for i in rec]))
+    names, tracts = canon(tracts, names, surr == 's')
     stderr.write('[%d item(s), %d transaction(s)]'
-                 % (len(items), len(tracts)))
+                 % (len(names), len(tracts)))
     stderr.write(' done [%.2fs].\n' % (time()-t))
     if supp > 0: supp = -ceil(0.01 *supp *len(tracts))
 
@@ -253,52 +508,98 @@ if __name__ == '__main__':
         if len(set(len(t) for t in tracts)) != 1:
             print('for shuffle surrogates transactions '
                  +'must have equal size'); exit()
-        items = dict([(i,set()) for i in items])
-        for t in tracts:        # collect items per position/column
-            for i in range(len(t)): items[t[i]].add(i)
-        for i in items:         # check occurrence of items
-            if len(items[i]) != 1:
-                print('for shuffle surrogates '
-                     +'%s must occur in only one column'); exit()
+        cols = [set() for i in names]
+        for t in tracts:        # collect positions/columns per item
+            for i in range(len(t)): cols[t[i]].add(i)
+        for i in range(len(cols)):  # check occurrence of items
+            if len(cols[i]) != 1:
+                print(('for shuffle surrogates '
+                      +'%s must occur in only one column') % names[i])
+                exit()
 
     # --- read or generate pattern spectrum ---
     t = time()                  # start timer, print log message
-    if cnt <= 0:                # if to read a pattern spectrum
+    key = psp = hist = None     # check for a cached pattern spectrum
+    if cnt > 0 and (hstfn or crit != 'x'):
+        hist = dict()           # collect histograms with surrogates
+    elif cache and cnt > 0 and seed != 0 and not part and tmax <= 0:
+        x = {'target': starg, 'supp': supp, 'zmin': zmin,
+             'zmax': zmax, 'surr': surr, 'cnt': cnt, 'seed': seed}
+        if stable > 0: x['stable'] = stable
+        if surr == 'e': x.update({'alpha': alpha, 'smpls': smpls})
+        if surr == 'e':         # note the implementation, since the
+            x['impl'] = 'patspec.estpsp' if PYFIM else 'fim.estpsp'
+        else:                   # backends yield different spectra
+            x['impl'] = 'fimsurr+pyfim'  if PYFIM else 'fim.genpsp'
+        key = pspkey(tracts, x) # compute the key of the spectrum
+        psp = cacheget(cache, key)
+    if psp is not None:         # if the pattern spectrum is cached
+        stderr.write('reading cached pattern spectrum %s ... ' % key)
+        key = None              # (no need to store it again)
+    elif cnt <= 0 and hstfn:    # if to read histograms
+        stderr.write('reading %s ... ' % hstfn)
+        hist = hstread(hstfn)   # read histograms from file
+        psp  = pspread(pspfn) if pspfn else hst2psp(hist)
+    elif cnt <= 0:              # if to read a pattern spectrum
         stderr.write('reading %s ... ' % pspfn)
-        psp = dict()            # initialize a pattern spectrum
-        with open(pspfn, 'r') as inp:
-            for line in inp:    # read pattern spectrum from file
-                z,c,n = line.split()
-                psp[int(z),int(c)] = float(n)
+        psp = pspread(pspfn)    # read pattern spectrum from file
     elif surr == 'e':           # if to estimate a pattern spectrum
         stderr.write('estimating pattern spectrum ... '); stderr.flush()
         psp = estpsp (tracts, starg, supp, zmin, zmax, '#',
                       cnt, alpha, smpls, seed)
     else:                       # if to generate a pattern spectrum
         stderr.write('generating pattern spectrum ... '); stderr.flush()
-        psp = genpsp(tracts, starg, supp, zmin, zmax, '#',
-                     cnt, surr, seed, cpus)
+        try:                    # generate (and checkpoint) spectrum
+            psp = fimpsp(tracts, starg, supp, zmin, zmax, '#',
+                         cnt, surr, seed, cpus, part, ckpt or None,
+                         stable, tmax, hist)
+        except ValueError as e: # (checkpoint may not match)
+            error('\n%s\n' % e)
     stderr.write('[%d signature(s)]' % len(psp))
     stderr.write(' done [%.2fs].\n' % (time()-t))
-    border = psp2bdr(psp)       # extract the decision border
+    if key:                     # store a new spectrum in the cache
+        cacheput(cache, key, psp, csize*1024*1024)
+
+    if part: exit()             # the shard has been written by fimpsp
+    if crit == 'x': border = psp2bdr(psp)   # extract decision border
+    else:           border = hst2bdr(hist, crit, level)
 
     # --- save generated pattern spectrum ---
     if cnt > 0 and pspfn != "": # if file name for pattern spectrum
         t = time()              # start timer, print log message
         stderr.write('writing %s ... ' % pspfn)
-        with open(pspfn, 'w') as out: # write pattern spectrum to a file
-            for s in sorted([(z,c,psp[z,c]) for z,c in psp]):
-                out.write(('%d'+pssep+'%d'+pssep+'%.16g\n') % s)
+        x = {'target': starg, 'supp': supp, 'zmin': zmin,
+             'zmax': zmax, 'surr': surr, 'seed': seed}
+        if surr not in 'ie' and stable <= 0 and tmax <= 0:
+            x['cnt'] = cnt      # (raw counters only for a fixed cnt)
+        pspwrite(psp, pspfn, pssep, x)  # write pattern spectrum
         stderr.write('[%d signature(s)]' % len(psp))
         stderr.write(' done [%.2fs].\n' % (time()-t))
 
+    # --- save per-signature histograms ---
+    if cnt > 0 and hstfn != "": # if file name for histograms
+        t = time()              # start timer, print log message
+        stderr.write('writing %s ... ' % hstfn)
+        hstwrite(hist, hstfn, pssep)    # write histograms
+        stderr.write('[%d signature(s)]' % len(hist))
+        stderr.write(' done [%.2fs].\n' % (time()-t))
+
     # --- analyze original data set ---
     if len(args) < 2: exit()    # check for an output file name
-    t = time()                  # start timer, print log message
-    stderr.write('analyzing original data ... ')
-    pats = fim(tracts, target, supp, zmin, zmax, 'a', border=border)
-    stderr.write('[%d pattern(s)]' % len(pats))
-    stderr.write(' done [%.2fs].\n' % (time()-t))
+    if PYFIM and pred == 'x':   # if no pattern set reduction follows,
+        pats = iter_fim(tracts, target, supp, zmin, zmax,
+                        border=border)  # mine while writing patterns
+    else:                       # if to collect all patterns
+        t = time()              # start timer, print log message
+        stderr.write('analyzing original data ... ')
+        if PYFIM:               # if to use the pure Python fim
+            pats = fim(tracts, target, supp, zmin, zmax, 'a',
+                       border=border, cpus=cpus)
+        else:                   # if to use the compiled fim module
+            pats = fim(tracts, target, supp, zmin, zmax, 'a',
+                       border=border)
+        stderr.write('[%d pattern(s)]' % len(pats))
+        stderr.write(' done [%.2fs].\n' % (time()-t))
 
     # --- pattern set reduction ---
     if pred != 'x':             # if to filter with pattern spectrum
@@ -311,12 +612,14 @@ if __name__ == '__main__':
     # --- write output file ---
     t = time()                  # start timer, print log message
     stderr.write('writing %s ... ' % args[1])
+    n = 0                       # init. the pattern counter
     with open(args[1], 'w') as out:
         for p,c in pats:        # traverse the reduced patterns
-            p = sorted(p)       # sort the items in the pattern
+            p = sorted([names[i] for i in p])
             for i in p[:-1]: out.write(str(i)+isep)
             out.write(p[-1])    # write the items of the pattern
             out.write(outfmt % c)
             out.write('\n')     # write the support information
-    stderr.write('[%d pattern(s)]' % len(pats))
+            n += 1              # count the written pattern
+    stderr.write('[%d pattern(s)]' % n)
     stderr.write(' done [%.2fs].\n' % (time()-t))
@@ -13,6 +13,12 @@ ROOT=$( dirname $SCRIPT )
 
 ACTIVITY_FIM_RASTER_DAT=$1
 FIM_PSF_PSR_ASSEMBLIES_DAT=${ACTIVITY_FIM_RASTER_DAT/_ACTIVITY-FIM-RASTER.dat/_FIM-PSF-PSR-ASSEMBLIES.dat}
+FIM_PSF_PSR_ASSEMBLIES_DAT=${FIM_PSF_PSR_ASSEMBLIES_DAT/_ACTIVITY-FIM-RASTER.bin/_FIM-PSF-PSR-ASSEMBLIES.dat}
+
+# prefer the binary raster (no text parsing) if it exists next to the text raster
+if [[ -e "${ACTIVITY_FIM_RASTER_DAT%.dat}.bin" ]]; then
+	ACTIVITY_FIM_RASTER_DAT="${ACTIVITY_FIM_RASTER_DAT%.dat}.bin"
+fi
 
 if [[ -e "${ACTIVITY_FIM_RASTER_DAT}" ]]; then
 	if ! [[ -e "${FIM_PSF_PSR_ASSEMBLIES_DAT}" ]]; then
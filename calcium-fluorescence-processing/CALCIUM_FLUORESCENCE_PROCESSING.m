@@ -32,7 +32,7 @@ if( exist( [ CALCIUM_FLUORESCENCE_file ] , 'file' ) == 2 )
     
     
     %% > MAKE *_ACTIVITY-RASTER.MAT ( => similarity-graph-clustering )
-    if( Q_presets( 'ALL' ) || Q_presets( 'ACTIVITY-RASTER' ) || Q_presets( 'ACTIVITY-FIM-RASTER' ) || Q_presets( 'ACTIVITY-ISING-FREQUENCIES' ) )
+    if( Q_presets( 'ALL' ) || Q_presets( 'ACTIVITY-RASTER' ) || Q_presets( 'ACTIVITY-FIM-RASTER' ) || Q_presets( 'ACTIVITY-FIM-RASTER-BIN' ) || Q_presets( 'ACTIVITY-ISING-FREQUENCIES' ) )
         
         fprintf( 1 , [ 'Prepare *_ACTIVITY-RASTER.MAT file for similarity-graph-clustering ...' '\n' ] );
         
@@ -134,6 +134,45 @@ if( exist( [ CALCIUM_FLUORESCENCE_file ] , 'file' ) == 2 )
         fprintf( 1 , [ '' '\n' ] );
     end
     
+    %% > MAKE *_ACTIVITY-FIM-RASTER.BIN ( => frequent-item-set-mining ("fim+psf+psr"), binary raster )
+    if( Q_presets( 'ALL' ) || Q_presets( 'ACTIVITY-FIM-RASTER-BIN' ) )
+        
+        fprintf( 1 , [ 'Prepare *_ACTIVITY-FIM-RASTER.BIN file for frequent-item-set-mining ...' '\n' ] );
+        
+        [ directory , name , ~ ] = fileparts( CALCIUM_FLUORESCENCE_file );
+        OUTPUT_PATH = [ directory '/' strrep( name , '_CALCIUM-FLUORESCENCE' , '_ACTIVITY-FIM-RASTER' ) '.bin' ];
+        
+        if( exist( OUTPUT_PATH , 'file' ) ~= 2 )
+            tic;
+            
+            % header: 'FIMR', version 1, packing 1 (bits), 2 reserved bytes, T, N (uint32, little endian)
+            % raster: ceil(N/8) bytes per time bin, most significant bit first
+            [ T , N ] = size( sig_dF_F_activity );
+            B = ceil( N / 8 );
+            
+            bits = zeros( 8 * B , T );
+            bits(1:N,:) = transpose( sig_dF_F_activity == 1 );
+            bytes = uint8( [ 128 64 32 16 8 4 2 1 ] * reshape( bits , 8 , B * T ) );
+            
+            i_ = fopen( OUTPUT_PATH , 'w' , 'ieee-le' );
+            
+            fwrite( i_ , 'FIMR' , 'char*1' );
+            fwrite( i_ , [ 1 1 0 0 ] , 'uint8' );
+            fwrite( i_ , [ T N ] , 'uint32' );
+            fwrite( i_ , bytes , 'uint8' );
+            
+            fclose( i_ );
+            
+            fileattrib( OUTPUT_PATH , '+w' , 'g' );
+            
+            toc
+        else
+            fprintf( 1 , [ '> ...' '\n' ] );
+        end
+        
+        fprintf( 1 , [ '' '\n' ] );
+    end
+    
     %% > MAKE *_ACTIVITY-ISING-FREQUENCIES.p ( => ACE )
     if( Q_presets( 'ALL' ) || Q_presets( 'ACTIVITY-ISING-FREQUENCIES' ) )
         